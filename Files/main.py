@@ -1,7 +1,10 @@
-from cncParts import Turret
-import random
+import sys
+from pathlib import Path
 
-from geneticAlgorithm import GA
+# The turret model and the GA live in the cnc package under src/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from cnc import GA, FitnessCache  # noqa: E402
 
 # magazine = Turret([1, 1, 3, 2, 2, 3, 4, 2], {1: 150, 2: 100, 3: 150, 4: 600})
 # ops = [4, 2, 3, 4, 1]
@@ -32,58 +35,46 @@ distr = {
     4:1,
     5:1,
 }
-# Create a GA instance
-ga = GA(U=3, ops=ops, tool_life_table=tool_life_table)
 
-# Step 1: Create the initial population
-population_size = 100
-population = ga.create_initial_population(population_size, djkParent)
 
-print("Initial Population (Tool IDs with Scores):")
-for idx, turret in enumerate(population):
-    score = ga.fitness_function(turret)
-    print(f"Turret {idx}: {[tool.id for tool in turret.array]}, Score: {score}")
+def report(generation, population, scores):
+    if generation == 0:
+        print("Initial Population (Tool IDs with Scores):")
+    else:
+        print(f"\nGeneration {generation} (Tool IDs with Scores):")
+    for idx, (turret, score) in enumerate(zip(population, scores, strict=True)):
+        print(f"Turret {idx}: {[tool.id for tool in turret.array]}, Score: {score}")
 
-# Run the GA for a few generations
+
+# Run the GA, keeping the best individual in every generation and stopping early
+# once the best score stops improving. The mutation rate rises from
+# mutation_rate towards max_mutation_rate as the population converges.
+population_size = 100
 num_generations = 5
 mutation_rate = 0.05
+max_mutation_rate = 0.1
 
-for generation in range(num_generations):
-    print(f"\nGeneration {generation + 1}")
 
-    # Step 2: Selection - Select the best U parents
-    parents = ga.selection(population)
-    print("Selected Parents (Tool IDs with Scores):")
-    for idx, parent in enumerate(parents):
-        score = ga.fitness_function(parent)
-        print(f"Parent {idx}: {[tool.id for tool in parent.array]}, Score: {score}")
+def main():
+    # Create a GA instance
+    cache = FitnessCache()
+    ga = GA(U=3, ops=ops, tool_life_table=tool_life_table, cache=cache)
 
-    # Step 3: Crossover - Create offspring from parents
-    new_population = []
-    while len(new_population) < population_size:
-        # Select two random parents for crossover
-        parent1, parent2 = random.sample(parents, 2)
-        offspring = ga.crossover(parent1, parent2)
+    result = ga.run(num_generations,
+                    population_size,
+                    djkParent,
+                    distr,
+                    mutation_rate=mutation_rate,
+                    max_mutation_rate=max_mutation_rate,
+                    elites=1,
+                    patience=3,
+                    callback=report)
 
-        # Step 4: Mutation - Mutate the offspring
-        offspring = ga.mutate(offspring, mutation_rate)
+    print(f"\nStopped after {result.generations} generations ({result.stop_reason}).")
+    print(f"Best turret: {result.layout}, Score: {result.score}")
+    print(f"Best score per generation: {result.history}")
+    print(f"Fitness cache: {cache.info()}")
 
-        # Step 5: Repair - Ensure the offspring is valid
-        offspring = ga.repair(offspring, distr)
-
-        # Add offspring to the new population
-        new_population.append(offspring)
-
-    # Replace the old population with the new one
-    population = new_population
-
-    print("New Population (Tool IDs with Scores):")
-    for idx, turret in enumerate(population):
-        score = ga.fitness_function(turret)
-        print(f"Turret {idx}: {[tool.id for tool in turret.array]}, Score: {score}")
 
-# Final generation population
-print(f"\nFinal Population after {num_generations} generations (Tool IDs with Scores):")
-for idx, turret in enumerate(population):
-    score = ga.fitness_function(turret)
-    print(f"Turret {idx}: {[tool.id for tool in turret.array]}, Score: {score}")
+if __name__ == "__main__":
+    main()
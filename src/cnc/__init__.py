@@ -0,0 +1,94 @@
+"""
+Turret layout optimization for CNC machines: the turret model and its scorers,
+the genetic algorithm, the island model and the exact solver.
+
+Names are imported from their modules on first access, so importing the package
+is cheap and has no side effects. NumPy is only loaded with the GA, the cost
+model, the solver or checkpoints, and multiprocessing only with the island
+model or a GA worker pool.
+
+The batch runner (python -m cnc) and the benchmarks (python -m
+cnc.benchmark) are the modules cnc.cli and cnc.benchmark.
+"""
+
+import importlib
+import typing as t
+
+if t.TYPE_CHECKING:
+    from .compat import PartRecord, RetiringTurret, TraceEvent, score
+    from .cost_model import CostModel
+    from .fitness_cache import CacheInfo, FitnessCache
+    from .ga_checkpoint import Checkpoint
+    from .genetic_algorithm import GA, GAResult, GAStats
+    from .island_model import IslandModel, IslandResult
+    from .schemas import JsonLinesTrace, Scenario, load_scenarios
+    from .solver import BranchAndBound, SolverResult, optimal_plan
+    from .turret import SlotIndex, Tool, Turret, TurretStats, least_rotation
+
+# Public name -> module defining it
+_EXPORTS = {
+    "Tool": "turret",
+    "Turret": "turret",
+    "TurretStats": "turret",
+    "SlotIndex": "turret",
+    "least_rotation": "turret",
+    "RetiringTurret": "compat",
+    "PartRecord": "compat",
+    "TraceEvent": "compat",
+    "score": "compat",
+    "Scenario": "schemas",
+    "JsonLinesTrace": "schemas",
+    "load_scenarios": "schemas",
+    "CostModel": "cost_model",
+    "CacheInfo": "fitness_cache",
+    "FitnessCache": "fitness_cache",
+    "Checkpoint": "ga_checkpoint",
+    "GA": "genetic_algorithm",
+    "GAResult": "genetic_algorithm",
+    "GAStats": "genetic_algorithm",
+    "IslandModel": "island_model",
+    "IslandResult": "island_model",
+    "BranchAndBound": "solver",
+    "SolverResult": "solver",
+    "optimal_plan": "solver",
+}
+
+__all__ = [
+    "Tool",
+    "Turret",
+    "TurretStats",
+    "SlotIndex",
+    "least_rotation",
+    "RetiringTurret",
+    "PartRecord",
+    "TraceEvent",
+    "score",
+    "Scenario",
+    "JsonLinesTrace",
+    "load_scenarios",
+    "CostModel",
+    "CacheInfo",
+    "FitnessCache",
+    "Checkpoint",
+    "GA",
+    "GAResult",
+    "GAStats",
+    "IslandModel",
+    "IslandResult",
+    "BranchAndBound",
+    "SolverResult",
+    "optimal_plan",
+]
+
+
+def __getattr__(name: str) -> t.Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> t.List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,9 @@
+"""
+python -m cnc: the batch runner of cnc.cli.
+"""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
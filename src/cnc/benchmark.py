@@ -0,0 +1,238 @@
+"""
+Benchmarks over the scenarios of data/turrets.json.
+
+Times Turret.find, Turret.score, the GA operators and whole GA generations, and
+writes the results (seconds per call) as JSON. When a baseline file exists the
+results are compared against it, and any benchmark slower than the baseline by
+more than the tolerance makes the run fail.
+
+Results are compared in units of a fixed calibration workload timed alongside
+every benchmark, so a baseline recorded on another machine or Python, or while
+the machine ran at another speed, still holds.
+
+Installed with the package as the cnc-benchmark command, or run as:
+
+    python -m cnc.benchmark                     # run and compare
+    python -m cnc.benchmark --save-baseline     # record a new baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import timeit
+import typing as t
+from collections import Counter
+from pathlib import Path
+
+from . import schemas
+from .genetic_algorithm import GA
+
+BASELINE_PATH = Path(__file__).parent / "data" / "benchmark_baseline.json"
+
+
+def calibrate() -> None:
+    """
+    Fixed workload of dict, tuple and sort operations, the kind the scorers and
+    GA operators spend their time on.
+    """
+    counts: t.Dict[int, int] = {}
+    for i in range(2000):
+        key = (i * 7919) % 97
+        counts[key] = counts.get(key, 0) + 1
+    sorted(counts.items(), key=lambda item: (item[1], item[0]))
+
+
+def autorange(timer: timeit.Timer, min_time: float) -> int:
+    """
+    Number of calls that makes one round of timer take at least min_time seconds.
+    """
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+    return number
+
+
+def measure(
+    func: t.Callable[[], t.Any], repeat: int, min_time: float
+) -> t.Tuple[float, float]:
+    """
+    Time per call of func over repeat rounds, each round running func often
+    enough to take at least min_time seconds and followed by a round of
+    calibrate, which runs at the same machine speed.
+
+    :return: The best time per call in seconds, and the median over the rounds
+    of the time per call in calibrate calls.
+    """
+    timer = timeit.Timer(func)
+    number = autorange(timer, min_time)
+    unit = timeit.Timer(calibrate)
+    unit_number = autorange(unit, min_time / 2)
+
+    seconds = []
+    units = []
+    for _ in range(repeat):
+        seconds.append(timer.timeit(number) / number)
+        units.append(seconds[-1] / (unit.timeit(unit_number) / unit_number))
+    return min(seconds), statistics.median(units)
+
+
+def cases(
+    name: str, scenario: schemas.Scenario, population_sizes: t.List[int]
+) -> t.Iterator[t.Tuple[str, t.Callable[[], t.Any]]]:
+    """
+    Benchmark cases of one scenario, as (name, function) pairs. Inputs are drawn
+    from a fixed seed so that runs are comparable.
+    """
+    turret = scenario.turret()
+    starts = range(turret.size)
+
+    def find() -> None:
+        for tool_id in scenario.operations:
+            for start in starts:
+                turret.find(tool_id, start)
+
+    yield f"{name}/find", find
+    yield f"{name}/score", scenario.score
+
+    random.seed(0)
+    ga = GA(
+        U=3,
+        ops=scenario.operations,
+        tool_life_table=scenario.data,
+        parts=scenario.parts,
+    )
+    distr = dict(Counter(scenario.allocation))
+    population = ga.create_initial_population(
+        max(population_sizes), scenario.allocation
+    )
+    parent1, parent2 = population[:2]
+    offspring = ga.crossover(parent1, parent2)
+
+    yield f"{name}/ga.fitness_function", lambda: ga.fitness_function(parent1.copy())
+    yield f"{name}/ga.crossover", lambda: ga.crossover(parent1, parent2)
+    yield f"{name}/ga.mutate", lambda: ga.mutate(parent1, 0.05)
+    yield f"{name}/ga.repair", lambda: ga.repair(offspring.copy(), distr)
+
+    for size in population_sizes:
+        individuals = population[:size]
+        yield (
+            f"{name}/ga.evaluate_population/{size}",
+            lambda individuals=individuals: ga.evaluate_population(individuals),
+        )
+
+        def generation(individuals=individuals, size=size) -> None:
+            # Reseeded so that every call breeds (and repairs) the same offspring
+            random.seed(size)
+            ga.next_generation(individuals, distr, size, 0.05, elites=1)
+
+        yield f"{name}/ga.generation/{size}", generation
+
+
+def run(
+    scenarios: t.Dict[str, schemas.Scenario],
+    population_sizes: t.List[int],
+    repeat: int,
+    min_time: float,
+) -> t.Tuple[t.Dict[str, float], t.Dict[str, float]]:
+    """
+    :return: Seconds per call and calibration units per call of every case.
+    """
+    results = {}
+    units = {}
+    for name, scenario in scenarios.items():
+        for case, func in cases(name, scenario, population_sizes):
+            results[case], units[case] = measure(func, repeat, min_time)
+            print(
+                f"{case:<45} {results[case] * 1e6:12.1f} us {units[case]:10.3f} units",
+                file=sys.stderr,
+            )
+    return results, units
+
+
+def compare(
+    results: t.Dict[str, float], baseline: t.Dict[str, float], tolerance: float
+) -> t.List[str]:
+    """
+    :param results: Time per call of every case, in the same unit as baseline.
+    :return: Descriptions of the benchmarks more than tolerance slower than the
+    baseline.
+    """
+    regressions = []
+    for case, seconds in results.items():
+        if case not in baseline:
+            continue
+        ratio = seconds / baseline[case]
+        if ratio > 1 + tolerance:
+            regressions.append(
+                f"{case}: {baseline[case]:.4g} -> {seconds:.4g} ({ratio:.2f}x)"
+            )
+    return regressions
+
+
+def main(argv: t.Optional[t.List[str]] = None) -> int:
+    # The docstring is stripped under python -OO
+    description = __doc__.split("\n\n")[1] if __doc__ else None
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--scenarios", nargs="*", help="Scenario names (default: all)")
+    parser.add_argument("--data", default=schemas.SCENARIOS_PATH, type=Path)
+    parser.add_argument(
+        "--population-sizes", nargs="*", type=int, default=[10, 50, 100]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--min-time", type=float, default=0.1)
+    parser.add_argument(
+        "--output", type=Path, help="Write results here (default: stdout)"
+    )
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        "--save-baseline", action="store_true", help="Store the results as the baseline"
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.5,
+        help="Allowed slowdown against the baseline (0.5 = 50%%)",
+    )
+    args = parser.parse_args(argv)
+
+    scenarios = schemas.load_scenarios(args.data)
+    if args.scenarios:
+        scenarios = {name: scenarios[name] for name in args.scenarios}
+
+    results, units = run(scenarios, args.population_sizes, args.repeat, args.min_time)
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+        "units": units,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(output + "\n")
+    else:
+        print(output)
+
+    if args.save_baseline:
+        args.baseline.write_text(output + "\n")
+        return 0
+    if not args.baseline.exists():
+        return 0
+
+    baseline = json.loads(args.baseline.read_text())
+    # Baselines recorded without calibration are compared in seconds
+    if "units" in baseline:
+        regressions = compare(units, baseline["units"], args.tolerance)
+    else:
+        regressions = compare(results, baseline["results"], args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,321 @@
+"""
+Batch optimization of turret layouts.
+
+Runs the GA on every job of a directory of scenario files or of a JSON-lines
+stream, in a pool of worker processes, and streams one JSON line per job (best
+layout, score, generations, wall time) as soon as the job finishes.
+
+A scenario is an object shaped like the entries of data/turrets.json. A .json
+file holds either one scenario, named after the file, or an object of named
+scenarios. Every line of a JSON-lines input holds one scenario, named by its
+optional "name" field.
+
+Installed with the package as the cnc command, or run as python -m cnc:
+
+    cnc scenarios/                      # every *.json file of scenarios/
+    cnc jobs.jsonl --time-budget 60     # at most a minute per job
+    cnc jobs.jsonl --checkpoint done.jsonl
+
+With --checkpoint, every finished job is appended to the checkpoint file, and
+the jobs already in it are skipped, so an interrupted batch resumes where it
+stopped.
+
+With --score, the layouts of the jobs are scored as they are instead, in this
+process unless --workers is given. The GA and NumPy are then never imported, so
+scoring a single layout starts in milliseconds.
+
+    cnc turrets.json --score                # scenario score
+    cnc turrets.json --score --wear keep    # GA objective
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import typing as t
+from collections import Counter
+from pathlib import Path
+
+from . import compat, schemas
+
+if t.TYPE_CHECKING:
+    from concurrent.futures import Future
+
+Job = t.Tuple[str, t.Dict[str, t.Any]]
+Task = t.Callable[[str, t.Dict[str, t.Any], t.Dict[str, t.Any]], t.Dict[str, t.Any]]
+
+
+def read_jobs(source: t.Union[str, Path]) -> t.Iterator[Job]:
+    """
+    Named raw scenarios of a directory, a .json file, or a JSON-lines file ("-"
+    for stdin).
+    """
+    if str(source) == "-":
+        yield from _read_lines(sys.stdin, "stdin")
+        return
+
+    path = Path(source)
+    if path.is_dir():
+        for file in sorted(path.glob("*.json")):
+            yield from _read_json(file)
+    elif path.suffix == ".json":
+        yield from _read_json(path)
+    else:
+        with open(path) as f:
+            yield from _read_lines(f, path.stem)
+
+
+def _read_json(path: Path) -> t.Iterator[Job]:
+    with open(path) as f:
+        raw = json.load(f)
+    if "allocation" in raw:
+        yield path.stem, raw
+    else:
+        for name, scenario in raw.items():
+            yield f"{path.stem}/{name}", scenario
+
+
+def _read_lines(lines: t.Iterable[str], prefix: str) -> t.Iterator[Job]:
+    for number, line in enumerate(lines, 1):
+        if line.strip():
+            raw = json.loads(line)
+            yield str(raw.pop("name", f"{prefix}/{number}")), raw
+
+
+def optimize(
+    name: str, raw: t.Dict[str, t.Any], settings: t.Dict[str, t.Any]
+) -> t.Dict[str, t.Any]:
+    """
+    Worker entry point: run the GA on one scenario.
+
+    :return: The JSON-ready result of the job.
+    """
+    from .fitness_cache import FitnessCache
+    from .genetic_algorithm import GA
+
+    start = time.monotonic()
+    scenario = schemas.Scenario.from_dict(raw)
+    random.seed(f"{settings['seed']}:{name}")
+
+    ga = GA(
+        U=settings["U"],
+        ops=scenario.operations,
+        tool_life_table=scenario.data,
+        parts=scenario.parts,
+        cache=FitnessCache(),
+    )
+    result = ga.run(
+        settings["generations"],
+        settings["population_size"],
+        scenario.allocation,
+        dict(Counter(scenario.allocation)),
+        mutation_rate=settings["mutation_rate"],
+        max_mutation_rate=settings["max_mutation_rate"],
+        elites=settings["elites"],
+        patience=settings["patience"],
+        time_budget=settings["time_budget"],
+    )
+    return {
+        "name": name,
+        "layout": result.layout,
+        "score": result.score,
+        "generations": result.generations,
+        "stop_reason": result.stop_reason,
+        "seconds": round(time.monotonic() - start, 3),
+    }
+
+
+def evaluate(
+    name: str, raw: t.Dict[str, t.Any], settings: t.Dict[str, t.Any]
+) -> t.Dict[str, t.Any]:
+    """
+    Worker entry point of --score: score the layout of one scenario with the
+    selected wear behaviour (see cnc.compat).
+
+    :return: The JSON-ready result of the job.
+    """
+    start = time.monotonic()
+    scenario = schemas.Scenario.from_dict(raw)
+    score = compat.score(
+        scenario.allocation,
+        scenario.data,
+        scenario.parts,
+        scenario.operations,
+        wear=settings["wear"],
+    )
+    return {
+        "name": name,
+        "layout": scenario.allocation,
+        "score": score,
+        "seconds": round(time.monotonic() - start, 3),
+    }
+
+
+def read_checkpoint(path: Path) -> t.Set[str]:
+    """
+    Names of the jobs completed in a checkpoint file. A line cut short by an
+    interruption is ignored.
+    """
+    done = set()
+    if path.exists():
+        with open(path) as f:
+            for line in f:
+                try:
+                    done.add(json.loads(line)["name"])
+                except (ValueError, KeyError):
+                    continue
+    return done
+
+
+def open_checkpoint(path: Path) -> t.TextIO:
+    """
+    Open a checkpoint file for appending results. A last line cut short by an
+    interruption is ended first, so that the next result starts a line of its
+    own instead of being lost with it.
+    """
+    if path.exists() and path.stat().st_size:
+        with open(path, "rb+") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+    return open(path, "a")  # noqa: SIM115
+
+
+def run(
+    jobs: t.Iterable[Job],
+    settings: t.Dict[str, t.Any],
+    workers: int,
+    emit: t.Callable[[t.Dict[str, t.Any]], None],
+    task: Task = optimize,
+) -> int:
+    """
+    Optimize the jobs and emit every result as soon as its job finishes. Failed
+    jobs are emitted as {"name": ..., "error": ...}.
+
+    :param workers: Worker processes (0 runs the jobs one by one in-process).
+    :param task: Function run on every job (optimize or evaluate).
+    :return: Number of failed jobs.
+    """
+    failures = 0
+    if not workers:
+        for name, raw in jobs:
+            try:
+                emit(task(name, raw, settings))
+            except Exception as error:
+                failures += 1
+                emit({"name": name, "error": repr(error)})
+        return failures
+
+    # The pool pulls in multiprocessing, which --score runs rarely need
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        running: t.Dict[Future, str] = {}
+        queue = iter(jobs)
+        try:
+            while True:
+                # Keep a couple of jobs queued per worker, reading the input lazily
+                for name, raw in queue:
+                    running[pool.submit(task, name, raw, settings)] = name
+                    if len(running) >= 2 * workers:
+                        break
+                if not running:
+                    break
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    name = running.pop(future)
+                    try:
+                        emit(future.result())
+                    except Exception as error:
+                        failures += 1
+                        emit({"name": name, "error": repr(error)})
+        except BaseException:
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+    return failures
+
+
+def main(argv: t.Optional[t.List[str]] = None) -> int:
+    # The docstring is stripped under python -OO
+    description = __doc__.split("\n\n")[1] if __doc__ else None
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "source",
+        help="Directory of .json files, .json file or JSON-lines file (-: stdin)",
+    )
+    parser.add_argument(
+        "--workers", type=int, help="Worker processes (default: one per CPU)"
+    )
+    parser.add_argument(
+        "--score", action="store_true", help="Score the layouts instead of optimizing"
+    )
+    parser.add_argument(
+        "--wear",
+        choices=compat.WEAR,
+        default="retire",
+        help="Score behaviour of --score (default: retire, the scenario score)",
+    )
+    parser.add_argument(
+        "--time-budget", type=float, help="Seconds per job (checked every generation)"
+    )
+    parser.add_argument("--generations", type=int, default=100)
+    parser.add_argument("--population-size", type=int, default=100)
+    parser.add_argument("--mutation-rate", type=float, default=0.05)
+    parser.add_argument(
+        "--max-mutation-rate",
+        type=float,
+        help="Raise the mutation rate up to this as the population converges",
+    )
+    parser.add_argument("--elites", type=int, default=1)
+    parser.add_argument("--patience", type=int)
+    parser.add_argument(
+        "-U", type=int, default=3, help="Parents selected per generation"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--checkpoint", type=Path, help="Append results here and skip the jobs in it"
+    )
+    args = parser.parse_args(argv)
+
+    settings = {
+        "U": args.U,
+        "generations": args.generations,
+        "population_size": args.population_size,
+        "mutation_rate": args.mutation_rate,
+        "max_mutation_rate": args.max_mutation_rate,
+        "elites": args.elites,
+        "patience": args.patience,
+        "time_budget": args.time_budget,
+        "seed": args.seed,
+        "wear": args.wear,
+    }
+    workers = args.workers
+    if workers is None:
+        workers = 0 if args.score else os.cpu_count() or 1
+    done = read_checkpoint(args.checkpoint) if args.checkpoint else set()
+    jobs = ((name, raw) for name, raw in read_jobs(args.source) if name not in done)
+
+    # Closed in the finally below, after the last result is written
+    checkpoint = open_checkpoint(args.checkpoint) if args.checkpoint else None
+
+    def emit(result: t.Dict[str, t.Any]) -> None:
+        line = json.dumps(result)
+        print(line, flush=True)
+        if checkpoint is not None and "error" not in result:
+            checkpoint.write(line + "\n")
+            checkpoint.flush()
+
+    try:
+        failures = run(
+            jobs, settings, workers, emit, evaluate if args.score else optimize
+        )
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        if checkpoint is not None:
+            checkpoint.close()
+    return 1 if failures else 0
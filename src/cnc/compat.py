@@ -0,0 +1,374 @@
+"""
+The two score behaviours of the turret model, kept selectable so that the fast
+paths can be checked against them.
+
+"keep" is Turret.score, the GA objective: worn tools stay in their slot and
+every part follows the same path from the ops[0] slot nearest to index 0, which
+is what Turret.traced_score, Turret.best_start and the GA's vectorized evaluator
+compute without walking every part.
+
+"retire" is RetiringTurret.score, the scenario score of the former
+schemas.Turret: scoring starts at a given slot, worn tools are retired from the
+turret (their slot holds tool 0 from then on) and the following lookups fall
+through to the next nearest copy. A RetiringTurret wraps a Turret rather than
+extending it, so the keep scorers are only reachable through its turret.
+"""
+
+from __future__ import annotations
+
+import typing as t
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+
+from .turret import Tool, Turret
+
+if t.TYPE_CHECKING:
+    from .cost_model import CostModel
+
+WEAR = ("keep", "retire")
+
+
+@dataclass
+class TraceEvent:
+    kind: str  # "path" when the path of a part changed, "missing" when a tool is absent
+    part: int  # Number of the part, from 1
+    remaining: int  # Parts left after this one
+    old_path: str  # 1-based slots visited by the previous path
+    new_path: str  # 1-based slots visited by this part (so far, for "missing")
+    weight: int  # Rotation distance of new_path
+    slots: t.List[t.Tuple[int, int]]  # (tool ID, life) per slot after the part
+
+
+@dataclass
+class PartRecord:
+    part: int  # Number of the (first) part, from 1
+    count: int  # Number of consecutive parts that followed path
+    path: t.List[int]  # Slot serving every operation
+    cost: int  # Rotation distance of one part
+    remaining: int  # Parts left after these
+    point: int  # Slot the spindle stopped at, where the next part starts
+    lives: t.List[int]  # Remaining life per slot afterwards
+    complete: bool  # False when a tool was missing and the part not finished
+
+
+TraceSink = t.Callable[[t.Any], None]
+
+
+class RetiringTool(Tool):
+    """
+    View of one slot of a RetiringTurret: using the tool wears it the retiring
+    way (see RetiringTurret.use).
+    """
+
+    __slots__ = ("retiring",)
+
+    def __init__(self, retiring: RetiringTurret, idx: int):
+        super().__init__(retiring.turret, idx)
+        self.retiring = retiring
+
+    @property
+    def use(self) -> bool:
+        return self.retiring.use(self.idx)
+
+
+class RetiringTurret:
+    """
+    Turret scored the way scenarios are, retiring worn tools. It has the
+    methods of the former schemas.Turret; the slots, their index and stats
+    are those of the wrapped Turret.
+    """
+
+    def __init__(self, slots: t.List[int], tool_data: t.Dict[int, int]):
+        """
+        :param slots: List of tool IDs to represent the tool arrangement in the turret.
+        :param tool_data: Dictionary mapping tool_id to tool_life.
+        """
+        self.turret = Turret(slots, tool_data)
+        self._tools: t.Optional[t.List[Tool]] = None
+
+    @classmethod
+    def wrap(cls, turret: Turret) -> RetiringTurret:
+        """
+        Score the given turret with retiring semantics, wearing its tools.
+        """
+        retiring = cls.__new__(cls)
+        retiring.turret = turret
+        retiring._tools = None
+        return retiring
+
+    def copy(self) -> RetiringTurret:
+        return self.wrap(self.turret.copy())
+
+    @property
+    def size(self) -> int:
+        return self.turret.size
+
+    @property
+    def ids(self) -> array:
+        return self.turret.ids
+
+    @property
+    def lives(self) -> array:
+        return self.turret.lives
+
+    @property
+    def array(self) -> t.List[Tool]:
+        """
+        Tool views over the slots, in ring order, whose use retires worn tools
+        like this turret does.
+        """
+        if self._tools is None:
+            self._tools = [RetiringTool(self, idx) for idx in range(self.size)]
+        return self._tools
+
+    def find(self, tool_id: int, start_idx: int = 0) -> t.List[t.Tuple[int, int]]:
+        return self.turret.find(tool_id, start_idx)
+
+    def use(self, idx: int) -> bool:
+        """
+        Wear the tool at idx once. Lives below 0 are left as they are.
+
+        :return: Whether the tool has life left.
+        """
+        lives = self.turret.lives
+        if lives[idx] >= 0:
+            lives[idx] -= 1
+        return lives[idx] > 0
+
+    def score(
+        self,
+        parts: int,
+        ops: t.List[int],
+        point: int = 0,
+        trace: t.Optional[TraceSink] = None,
+    ):
+        """
+        Total rotation distance to machine the given number of parts, starting
+        with the spindle at point.
+
+        Parts are simulated one at a time only around tool wear-out events: once
+        a part retires no tool and ends where it started, the following parts
+        repeat its path until the first tool on it runs out of life, so they are
+        added in one step.
+
+        Scoring is silent. With a trace sink, such as list.append or a
+        JsonLinesTrace, a TraceEvent is passed to it whenever the path of a
+        part changes and when a tool is missing from the turret.
+        """
+        score = 0
+        path_string_prev = ""
+        for record in self.simulate(parts, ops, point):
+            path_string_curr = "".join(str(index + 1) for index in record.path)
+            if not record.complete:
+                if trace is not None:
+                    trace(
+                        self._event(
+                            "missing",
+                            parts,
+                            record.remaining + 1,
+                            path_string_prev,
+                            path_string_curr,
+                            record.cost,
+                        )
+                    )
+                return score
+
+            score += record.count * record.cost
+            if path_string_curr != path_string_prev:
+                if trace is not None:
+                    trace(
+                        self._event(
+                            "path",
+                            parts,
+                            record.remaining + 1,
+                            path_string_prev,
+                            path_string_curr,
+                            record.cost,
+                        )
+                    )
+                path_string_prev = path_string_curr
+        return score
+
+    def simulate(
+        self, parts: int, ops: t.List[int], point: int = 0, fast_forward: bool = True
+    ) -> t.Iterator[PartRecord]:
+        """
+        Machine the given number of parts lazily, yielding a PartRecord for
+        every part walked and, with fast_forward, one for every steady-state run
+        of identical parts up to the next wear-out event (see score). Tools wear
+        out on this turret as the records are consumed and memory use does not
+        grow with the number of parts.
+
+        The generator can be dropped at any record: resume(record, ops) on the
+        same turret carries on from there. A record with complete False ends
+        the run: a tool of ops was missing.
+        """
+        # Always start scoring if we are pointing at the correct index
+        if ops[0] != self.turret.ids[point]:
+            raise ValueError(f"""{self.array[point]} was present at position,
+                but operation starts from Tool with id {ops[0]}""")
+        return self._simulate(parts, ops, point, fast_forward, 1)
+
+    def resume(
+        self, record: PartRecord, ops: t.List[int], fast_forward: bool = True
+    ) -> t.Iterator[PartRecord]:
+        """
+        Continue a simulation after the given record, which must be the last
+        one consumed from a simulation of this turret.
+        """
+        if not record.complete:
+            return iter(())
+        part = record.part + record.count
+        return self._simulate(record.remaining, ops, record.point, fast_forward, part)
+
+    def _simulate(
+        self,
+        parts: int,
+        ops: t.List[int],
+        point: int,
+        fast_forward: bool,
+        part: int,
+    ) -> t.Iterator[PartRecord]:
+        turret = self.turret
+        stats = turret.stats
+        lives = turret.lives
+        while parts > 0:
+            cost = 0
+            path: t.List[int] = []
+            start = point
+            worn = False
+            uses: t.Counter[int] = Counter()
+            for tool_id in ops:
+                nearest = turret.index.nearest(tool_id, point)
+                if stats is not None:
+                    stats.finds += 1
+                if nearest is None:
+                    yield self._record(part, 1, path, cost, parts - 1, point, False)
+                    return
+
+                # Worn tools are retired, so the next lookup falls through to the
+                # next nearest copy of the same tool
+                while nearest is not None:
+                    index, distance = nearest
+                    if self.use(index):
+                        path.append(index)
+                        cost += abs(distance)
+                        point = index
+                        uses[index] += 1
+                        break
+                    turret.set_slot(index, 0)
+                    worn = True
+                    nearest = turret.index.nearest(tool_id, point)
+                    if stats is not None:
+                        stats.finds += 1
+                        stats.wear_outs += 1
+            parts -= 1
+            if stats is not None:
+                stats.parts_simulated += 1
+            yield self._record(part, 1, path, cost, parts, point, True)
+            part += 1
+
+            # Steady state: repeat this part for as long as every tool on its path
+            # has life left, i.e. up to the next wear-out event
+            if fast_forward and not worn and point == start and parts > 0:
+                repeats = min(parts, *((lives[i] - 1) // n for i, n in uses.items()))
+                if repeats == 0:
+                    continue
+                for index, n in uses.items():
+                    lives[index] -= repeats * n
+                parts -= repeats
+                if stats is not None:
+                    stats.parts_skipped += repeats
+                yield self._record(part, repeats, path, cost, parts, point, True)
+                part += repeats
+
+    def _record(
+        self,
+        part: int,
+        count: int,
+        path: t.List[int],
+        cost: int,
+        remaining: int,
+        point: int,
+        complete: bool,
+    ) -> PartRecord:
+        return PartRecord(
+            part=part,
+            count=count,
+            path=path,
+            cost=cost,
+            remaining=remaining,
+            point=point,
+            lives=self.turret.lives.tolist(),
+            complete=complete,
+        )
+
+    def best_start(self, parts: int, ops: t.List[int]) -> t.Optional[t.Tuple[int, int]]:
+        """
+        Score every slot holding ops[0] as the start point, each on a copy of
+        the turret so that this one keeps its tool lives.
+
+        :return: (start slot, score) of the best start, the lowest slot on
+        ties, or None when a tool of ops is missing from the turret.
+        """
+        positions = self.turret.index.positions
+        if any(tool_id not in positions for tool_id in ops):
+            return None
+
+        best: t.Optional[t.Tuple[int, int]] = None
+        for start in positions[ops[0]]:
+            score = self.copy().score(parts, ops, start)
+            if best is None or score < best[1]:
+                best = start, score
+        return best
+
+    def _event(
+        self,
+        kind: str,
+        total: int,
+        parts: int,
+        old_path: str,
+        new_path: str,
+        weight: int,
+    ) -> TraceEvent:
+        """
+        Trace event of the part machined while parts (counting it) were left.
+        """
+        return TraceEvent(
+            kind=kind,
+            part=total - parts + 1,
+            remaining=parts - 1,
+            old_path=old_path,
+            new_path=new_path,
+            weight=weight,
+            slots=list(zip(self.turret.ids, self.turret.lives, strict=True)),
+        )
+
+
+def score(
+    slots: t.Sequence[int],
+    tool_data: t.Dict[int, int],
+    parts: int,
+    ops: t.List[int],
+    wear: str = "keep",
+    point: t.Optional[int] = None,
+    cost: t.Optional[CostModel] = None,
+) -> float:
+    """
+    Score a layout on a new turret with either score behaviour.
+
+    :param wear: "keep" (Turret.score) or "retire" (RetiringTurret.score).
+    :param point: Start slot of "retire" scoring (default: the first slot
+    holding ops[0]).
+    :param cost: Cost model of "keep" scoring.
+    """
+    if wear == "keep":
+        return Turret(list(slots), tool_data).score(parts, ops, cost)
+    if wear != "retire":
+        raise ValueError(f"Unknown wear behaviour {wear!r}, expected one of {WEAR}")
+    if cost is not None:
+        raise ValueError("Retiring scores are in slot steps, without a cost model.")
+    if point is None:
+        point = list(slots).index(ops[0])
+    return RetiringTurret(list(slots), tool_data).score(parts, ops, point)
@@ -0,0 +1,85 @@
+import hashlib
+import typing as t
+
+import numpy as np
+
+
+class CostModel:
+
+    def __init__(self, matrix: np.ndarray) -> None:
+        """
+        Cost of moving the turret between slots, e.g. in seconds of index
+        time. matrix[i, j] is the cost of the move from slot i to slot j, in
+        the direction the nearest-slot lookups take (the shorter one,
+        clockwise on ties); the diagonal is the cost of staying in place.
+
+        Scoring with a cost model sums matrix entries instead of slot steps.
+        The slot serving each operation is still the nearest one.
+
+        :param matrix: Square array with one row and column per slot.
+        """
+        matrix = np.array(matrix, dtype=np.float64)
+        if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+            raise ValueError("The cost matrix must be square.")
+        matrix.flags.writeable = False
+        self.matrix: np.ndarray = matrix  # Cost per (from, to) slot pair
+        self.size: int = len(matrix)  # Number of slots
+        self.rows: t.List[t.List[float]] = matrix.tolist(
+        )  # The matrix as lists, for scalar lookups
+        self.key: str = hashlib.sha1(
+            matrix.tobytes()).hexdigest()  # Identifies the costs in cache keys
+
+        # Costs that only depend on the move, not on where it starts, keep
+        # the scores of all rotations of a layout equal
+        shifts = (np.arange(self.size)[:, None] +
+                  np.arange(self.size)[None, :]) % self.size
+        self.circulant: bool = bool(
+            (matrix[np.arange(self.size)[:, None],
+                    shifts] == matrix[0][None, :]).all())
+
+    @staticmethod
+    def moves(size: int) -> np.ndarray:
+        """
+        Signed distance of the move between every pair of slots of a ring of
+        the given size (clockwise: +ve, anticlockwise: -ve), in the direction
+        the nearest-slot lookups take.
+        """
+        cw = (np.arange(size)[None, :] - np.arange(size)[:, None]) % size
+        return np.where(cw <= size - cw, cw, cw - size)
+
+    @classmethod
+    def steps(cls, size: int) -> "CostModel":
+        """
+        The default cost: one per slot step, as Turret.score counts it.
+        """
+        return cls(np.abs(cls.moves(size)))
+
+    @classmethod
+    def indexing(cls,
+                 size: int,
+                 step_time: float = 1.0,
+                 acw_step_time: t.Optional[float] = None,
+                 ramp_steps: float = 0.0,
+                 tool_change: float = 0.0) -> "CostModel":
+        """
+        Index time of a turret with a trapezoidal speed profile.
+
+        :param size: Number of slots.
+        :param step_time: Seconds per slot step at full speed, clockwise.
+        :param acw_step_time: The same anticlockwise (default: step_time).
+        :param ramp_steps: Steps the turret needs to reach full speed (and to
+        stop). Moves shorter than two ramps never reach full speed.
+        :param tool_change: Fixed seconds added to every move to another slot.
+        """
+        if acw_step_time is None:
+            acw_step_time = step_time
+        moves = cls.moves(size)
+        steps = np.abs(moves).astype(np.float64)
+        step_times = np.where(moves >= 0, step_time, acw_step_time)
+
+        # Accelerating over a ramp takes twice as long as cruising over it
+        cruise = steps + 2 * ramp_steps
+        triangle = 2 * np.sqrt(2 * steps * ramp_steps)
+        seconds = step_times * np.where(steps >= 2 * ramp_steps, cruise,
+                                        triangle)
+        return cls(np.where(steps > 0, seconds + tool_change, 0.0))
@@ -0,0 +1,116 @@
+import typing as t
+from collections import OrderedDict
+
+# (layout, ops, tool lives, parts, cost model key, multi_start), see key
+Key = t.Tuple[t.Any, ...]
+
+
+class CacheInfo(t.NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class FitnessCache:
+
+    def __init__(self,
+                 maxsize: int = 4096,
+                 rotations: bool = False) -> None:
+        """
+        Bounded LRU cache of turret scores, keyed on the slot layout, the
+        operations, the tool life table, the number of parts and the scoring
+        mode, so that GAs scoring differently can share one cache.
+
+        :param maxsize: Maximum number of scores kept before the least recently
+        used one is evicted.
+        :param rotations: Store each layout rotated so that its starting slot
+        (the ops[0] slot nearest to index 0) comes first. Turret.score only uses
+        distances relative to that slot, so all rotations sharing it have the
+        same score and the same key.
+
+        Mirror images are not merged: equidistant tools are resolved clockwise,
+        so a layout and its mirror score differently whenever a lookup hits
+        such a tie.
+        """
+        self.maxsize: int = maxsize
+        self.rotations: bool = rotations
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._scores: t.OrderedDict[Key, float] = OrderedDict()
+
+    def key(self,
+            ids: t.Sequence[int],
+            ops: t.List[int],
+            tool_life_table: t.Dict[int, int],
+            parts: int,
+            cost_model: t.Optional[t.Any] = None,
+            multi_start: bool = False) -> Key:
+        """
+        Build the cache key of a layout scored on the given job, optionally
+        with a cost_model.CostModel and from the best start slot (see
+        Turret.best_start).
+        """
+        return (self.canonical(ids, ops[0]), tuple(ops),
+                tuple(sorted(tool_life_table.items())), parts,
+                cost_model.key if cost_model is not None else None,
+                multi_start)
+
+    def canonical(self, ids: t.Sequence[int],
+                  first_tool: int) -> t.Tuple[int, ...]:
+        """
+        Canonical form of a layout according to the rotations setting.
+
+        :param ids: Tool IDs in ring order.
+        :param first_tool: Tool ID of the first operation.
+        """
+        layout = tuple(ids)
+        if not self.rotations or first_tool not in layout:
+            return layout
+
+        # Starting slot: nearest first_tool to index 0, clockwise on ties
+        size = len(layout)
+        first = layout.index(first_tool)
+        last = size - 1 - layout[::-1].index(first_tool)
+        start = first if first <= (size - last) % size else last
+
+        return layout[start:] + layout[:start]
+
+    def get(self, key: Key) -> t.Optional[float]:
+        """
+        :return: The cached score for key, or None on a miss.
+        """
+        score = self._scores.get(key)
+        if score is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._scores.move_to_end(key)
+        return score
+
+    def put(self, key: Key, score: float) -> None:
+        self._scores[key] = score
+        self._scores.move_to_end(key)
+        while len(self._scores) > self.maxsize:
+            self._scores.popitem(last=False)
+            self.evictions += 1
+
+    def items(self) -> t.List[t.Tuple[Key, float]]:
+        """
+        (key, score) pairs, least recently used first, so that putting them
+        back in order restores the LRU order.
+        """
+        return list(self._scores.items())
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize,
+                         len(self._scores))
+
+    def clear(self) -> None:
+        """
+        Drop all cached scores and reset the statistics.
+        """
+        self._scores.clear()
+        self.hits = self.misses = self.evictions = 0
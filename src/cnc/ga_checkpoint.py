@@ -0,0 +1,119 @@
+import json
+import mmap
+import os
+import struct
+import typing as t
+from dataclasses import dataclass, field
+
+import numpy as np
+
+MAGIC = b"GACKPT01"
+HEADER = struct.Struct("<8sQ")  # Magic, length of the JSON header
+ALIGN = 8
+
+
+@dataclass
+class Checkpoint:
+    generation: int  # Generations run so far
+    ids: np.ndarray  # Tool ID per slot, one row per individual
+    lives: np.ndarray  # Remaining tool life per slot, same shape as ids
+    scores: np.ndarray  # Score of every individual
+    best_layout: t.List[int]  # Best tool arrangement found so far
+    best_score: float  # Score of best_layout
+    history: t.List[float]  # Best score of each generation
+    stale: int  # Generations since best_score last improved
+    random_state: t.Tuple[t.Any, ...]  # random.getstate()
+    cache: t.Optional[t.Dict[str,
+                             t.Any]] = None  # FitnessCache settings, counters
+    cache_layouts: np.ndarray = field(default_factory=lambda: np.zeros(
+        (0, 0), dtype=np.int32))  # Cached canonical layouts, LRU first
+    cache_scores: np.ndarray = field(default_factory=lambda: np.zeros(
+        0, dtype=np.int64))  # Score of every cached layout
+
+
+def _aligned(size: int) -> int:
+    return -(-size // ALIGN) * ALIGN
+
+
+def save(path: t.Union[str, os.PathLike], checkpoint: Checkpoint) -> None:
+    """
+    Write a checkpoint: a small JSON header followed by the raw, aligned int
+    arrays. The file is written next to path and moved over it once complete,
+    so an interrupted save leaves the previous checkpoint intact.
+    """
+    version, internal, gauss_next = checkpoint.random_state
+    arrays: t.Dict[str, np.ndarray] = {
+        "ids": np.ascontiguousarray(checkpoint.ids, dtype=np.int32),
+        "lives": np.ascontiguousarray(checkpoint.lives, dtype=np.int32),
+        "scores": np.ascontiguousarray(checkpoint.scores),
+        "random": np.array(internal, dtype=np.uint32),
+        "cache_layouts": np.ascontiguousarray(checkpoint.cache_layouts,
+                                              dtype=np.int32),
+        "cache_scores": np.ascontiguousarray(checkpoint.cache_scores),
+    }
+    header: t.Dict[str, t.Any] = {
+        "generation": checkpoint.generation,
+        "best_layout": checkpoint.best_layout,
+        "best_score": checkpoint.best_score,
+        "history": checkpoint.history,
+        "stale": checkpoint.stale,
+        "random": [version, gauss_next],
+        "cache": checkpoint.cache,
+        "arrays": {},
+    }
+
+    # Array offsets are relative to the (aligned) end of the header
+    offset = 0
+    for name, array in arrays.items():
+        header["arrays"][name] = [array.dtype.str, array.shape, offset]
+        offset += _aligned(array.nbytes)
+    encoded = json.dumps(header).encode()
+    start = _aligned(HEADER.size + len(encoded))
+
+    tmp = f"{os.fspath(path)}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, len(encoded)))
+        f.write(encoded)
+        for name, array in arrays.items():
+            f.seek(start + header["arrays"][name][2])
+            f.write(array.tobytes())
+        f.truncate(start + offset)
+    os.replace(tmp, path)
+
+
+def load(path: t.Union[str, os.PathLike]) -> Checkpoint:
+    """
+    Read a checkpoint written by save. The file is memory-mapped and the
+    arrays of the returned checkpoint are read-only views into it, so nothing
+    is copied until they are used.
+    """
+    with open(path, "rb") as f:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, length = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError(f"{os.fspath(path)} is not a GA checkpoint.")
+    header = json.loads(buffer[HEADER.size:HEADER.size + length])
+    start = _aligned(HEADER.size + length)
+
+    arrays = {}
+    for name, (dtype, shape, offset) in header["arrays"].items():
+        count = int(np.prod(shape))
+        arrays[name] = np.frombuffer(buffer, dtype, count,
+                                     start + offset).reshape(shape)
+
+    version, gauss_next = header["random"]
+    return Checkpoint(
+        generation=header["generation"],
+        ids=arrays["ids"],
+        lives=arrays["lives"],
+        scores=arrays["scores"],
+        best_layout=header["best_layout"],
+        best_score=header["best_score"],
+        history=header["history"],
+        stale=header["stale"],
+        random_state=(version, tuple(arrays["random"].tolist()), gauss_next),
+        cache=header["cache"],
+        cache_layouts=arrays["cache_layouts"],
+        cache_scores=arrays["cache_scores"],
+    )
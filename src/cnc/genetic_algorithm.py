@@ -0,0 +1,1039 @@
+import math
+import os
+import random
+import time
+import typing as t
+from array import array
+from dataclasses import dataclass, field
+from functools import partial
+from itertools import chain
+
+import numpy as np
+
+from . import ga_checkpoint
+from .cost_model import CostModel
+from .fitness_cache import FitnessCache, Key
+from .ga_checkpoint import Checkpoint
+from .turret import Turret, TurretStats, least_rotation
+
+if t.TYPE_CHECKING:
+    from concurrent.futures import ProcessPoolExecutor
+
+PHASES = ("selection", "crossover", "mutate", "repair", "evaluation")
+CROSSOVERS = ("splice", "ox", "pmx")
+
+
+@dataclass
+class GAResult:
+    layout: t.List[int]  # Best tool arrangement found
+    score: float  # Score of the best layout (lower is better)
+    generations: int  # Number of generations run
+    history: t.List[float]  # Best score of each generation (initial population first)
+    stop_reason: str  # "generations", "plateau", "time" or "bound"
+
+
+@dataclass
+class GAStats:
+    totals: t.Dict[str, float] = field(
+        default_factory=dict)  # Seconds per phase, cache hits and misses
+    generations: t.List[t.Dict[str, float]] = field(
+        default_factory=list)  # The same counters for every generation
+    turret: TurretStats = field(
+        default_factory=TurretStats)  # Lookups and wear-outs of all turrets
+
+    def add(self, counter: str, value: float) -> None:
+        """
+        Add value to a counter of the current generation and to its total.
+        """
+        if not self.generations:
+            self.generations.append({})
+        generation = self.generations[-1]
+        generation[counter] = generation.get(counter, 0) + value
+        self.totals[counter] = self.totals.get(counter, 0) + value
+
+    def summary(self) -> str:
+        """
+        Human readable table of the totals.
+        """
+        seconds = sum(self.totals.get(phase, 0.0) for phase in PHASES) or 1.0
+        lines = [
+            f"{phase:<12} {self.totals.get(phase, 0.0):9.4f} s "
+            f"{100 * self.totals.get(phase, 0.0) / seconds:5.1f} %"
+            for phase in PHASES
+        ]
+        lines.append(f"{'cache':<12} {int(self.totals.get('cache_hits', 0))} "
+                     f"hits, {int(self.totals.get('cache_misses', 0))} misses")
+        lines.append(f"{'evaluations':<12} "
+                     f"{int(self.totals.get('evaluations', 0))} layouts scored")
+        lines.append(f"{'turret':<12} {self.turret.finds} finds, "
+                     f"{self.turret.scanned} scanned, "
+                     f"{self.turret.wear_outs} wear-outs")
+        return "\n".join(lines)
+
+
+def _best_start_score(turret: Turret,
+                      parts: int,
+                      ops: t.List[int],
+                      cost: t.Optional[CostModel] = None) -> float:
+    """
+    Score of a turret from its best start slot, 0 when a tool is missing like
+    Turret.score.
+    """
+    best = turret.best_start(parts, ops, cost)
+    return best[1] if best is not None else 0
+
+
+def _score_layouts(layouts: t.List[array],
+                   ops: t.List[int],
+                   tool_life_table: t.Dict[int, int],
+                   parts: int,
+                   multi_start: bool = False,
+                   cost: t.Optional[CostModel] = None) -> t.List[float]:
+    """
+    Worker entry point for parallel evaluation: score a chunk of slot layouts
+    with Turret.traced_score, which follows one part instead of walking them
+    all, or from their best start slot.
+    """
+    if multi_start:
+        return [
+            _best_start_score(Turret(layout, tool_life_table), parts, ops,
+                              cost) for layout in layouts
+        ]
+    return [
+        Turret(layout, tool_life_table).traced_score(parts, ops, cost)
+        for layout in layouts
+    ]
+
+
+class GA:
+
+    def __init__(self,
+                 U: int,
+                 ops: t.List[int],
+                 tool_life_table: t.Dict[int, int],
+                 parts: int = 300,
+                 cache: t.Optional[FitnessCache] = None,
+                 workers: int = 0,
+                 chunksize: t.Optional[int] = None,
+                 delta: bool = False,
+                 stats: bool = False,
+                 crossover_method: str = "splice",
+                 multi_start: bool = False,
+                 cost_model: t.Optional[CostModel] = None) -> None:
+        """
+        Initialize the genetic algorithm.
+
+        :param U: Number of individuals to select for breeding (best + U-1).
+        :param ops: List of tool operations to perform.
+        :param tool_life_table: Dictionary mapping tool ID to tool life.
+        :param parts: Number of parts each turret is scored on.
+        :param cache: Optional fitness cache shared by all evaluations.
+        :param workers: Number of worker processes for evaluate_population. With
+        0, populations are scored in-process by the vectorized evaluator.
+        :param chunksize: Layouts sent to a worker per task (default: about four
+        tasks per worker).
+        :param delta: Score in-process with Turret.traced_score, which re-walks
+        only the part of an offspring's path that its changed slots can affect.
+        crossover and mutate then record each offspring's lineage.
+        :param stats: Collect phase timings, cache counters and turret lookup
+        counts in self.stats. Lookups of the vectorized evaluator are not
+        counted, it does not go through Turret.
+        :param crossover_method: "splice" (one-point crossover, the offspring
+        may need repair), or the order-preserving "ox" (order crossover) or
+        "pmx" (partially mapped crossover), whose offspring keep the tool
+        distribution of their parents.
+        :param multi_start: Score every layout from its best start slot (see
+        Turret.best_start) rather than from the ops[0] slot nearest to index 0.
+        Scores then no longer depend on how a layout is rotated, so individuals
+        are kept in their least rotation and rotations of a layout are one
+        individual. Best layouts are returned turned to their best start.
+        :param cost_model: Score the cost of every move (e.g. seconds of index
+        time) from this model instead of slot steps. Scores are then floats.
+        Models whose costs depend on the start slot (not circulant) cannot be
+        used with multi_start or a rotation-aware cache.
+        """
+        if crossover_method not in CROSSOVERS:
+            raise ValueError(f"Unknown crossover method {crossover_method!r}, "
+                             f"expected one of {CROSSOVERS}")
+        if (cost_model is not None and not cost_model.circulant
+                and (multi_start or cache is not None and cache.rotations)):
+            raise ValueError(
+                "Rotations of a layout score differently under this cost "
+                "model, so it cannot be used with multi_start or a "
+                "rotation-aware cache.")
+
+        self.U: int = U  # Number of individuals to select (best + U-1)
+        self.ops: t.List[int] = ops  # List of operations
+        self.tool_life_table: t.Dict[int,
+                                     int] = tool_life_table  # Tool life table
+        self.parts: int = parts  # Parts per fitness evaluation
+        self.cache: t.Optional[FitnessCache] = cache  # Fitness cache
+        self.workers: int = workers  # Worker processes (0: in-process)
+        self.chunksize: t.Optional[int] = chunksize  # Layouts per worker task
+        self._pool: t.Optional["ProcessPoolExecutor"] = None
+        self.delta: bool = delta  # Incremental scoring from parent traces
+        self.stats: t.Optional[GAStats] = GAStats(
+        ) if stats else None  # Instrumentation counters
+        self.crossover_method: str = crossover_method  # Crossover operator
+        self.multi_start: bool = multi_start  # Score from the best start slot
+        self.cost_model: t.Optional[
+            CostModel] = cost_model  # Move costs (None: slot steps)
+        self._score_dtype: t.Type[np.number] = (np.int64 if cost_model is None
+                                                else np.float64)
+        # Scratch buffers of repair and the order-preserving crossovers, so
+        # that breeding allocates no dict, list or Counter per offspring: a
+        # count per tool ID, which is left zeroed after every use, and two
+        # int buffers per slot
+        self._counts: array = array("i", [0]) * (max(tool_life_table,
+                                                     default=0) + 1)
+        self._slots1: array = array("i")
+        self._slots2: array = array("i")
+
+    def __enter__(self) -> "GA":
+        return self
+
+    def __exit__(self, *exc_info: t.Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Shut down the worker pool, if one was started.
+        """
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def selection(
+            self,
+            population: t.List[Turret],
+            scores: t.Optional[np.ndarray] = None) -> t.List[Turret]:
+        """
+        Select the best individuals from the population for breeding.
+
+        :param population: List of Turret instances representing the current population.
+        :param scores: Scores of the population, if already evaluated.
+        :return: List of selected parent Turrets.
+        """
+        if scores is None:
+            scores = self.evaluate_population(population)
+        fitness_scores: t.List[t.Tuple[Turret, float]] = list(
+            zip(population, scores.tolist(), strict=True))
+
+        # Sort the population based on fitness scores (lower score is better)
+        fitness_scores.sort(key=lambda x: x[1])
+
+        # Select the best turret
+        selected_parents: t.List[Turret] = [fitness_scores[0][0]
+                                            ]  # Best individual
+
+        # Select U - 1 additional parents randomly from the remaining individuals
+        remaining_parents: t.List[t.Tuple[Turret, float]] = fitness_scores[
+            1:]  # Exclude the best individual
+
+        # Randomly choose U - 1 individuals from the remaining population
+        additional_parents: t.List[t.Tuple[Turret, float]] = random.sample(
+            remaining_parents, min(self.U - 1, len(remaining_parents)))
+
+        # Append these additional parents to the selected list
+        selected_parents.extend(turret for turret, _ in additional_parents)
+
+        return selected_parents
+
+    def crossover(self, parent1: Turret, parent2: Turret) -> Turret:
+        """
+        Perform crossover between two parent Turrets to create an offspring.
+
+        :param parent1: First parent Turret.
+        :param parent2: Second parent Turret.
+        :return: New Turret instance created from the parents.
+        """
+        # Ensure both parents have the same number of slots
+        if parent1.size != parent2.size:
+            raise ValueError(
+                "Parents must have the same number of slots for crossover.")
+
+        if self.crossover_method == "splice":
+            # Randomly choose a crossover point and splice the parents' buffers.
+            # Individuals never wear their tools (fitness_function scores a
+            # copy), so the spliced lives are those of new tools.
+            crossover_point: int = random.randint(1, parent1.size - 1)
+            ids = parent1.ids[:crossover_point] + parent2.ids[crossover_point:]
+            lives = (parent1.lives[:crossover_point] +
+                     parent2.lives[crossover_point:])
+        elif self.crossover_method == "ox":
+            ids, lives = self._order_crossover(parent1, parent2)
+        else:
+            ids, lives = self._partially_mapped_crossover(parent1, parent2)
+
+        offspring: Turret = Turret.from_buffers(ids, lives, parent1.stats)
+
+        if self.delta:
+            # Derive the offspring from the parent it differs least from
+            changed1: t.List[int] = [
+                i for i in range(offspring.size) if ids[i] != parent1.ids[i]
+            ]
+            changed2: t.List[int] = [
+                i for i in range(offspring.size) if ids[i] != parent2.ids[i]
+            ]
+            if len(changed1) <= len(changed2):
+                offspring.derive(parent1, changed1)
+            else:
+                offspring.derive(parent2, changed2)
+
+        return offspring
+
+    def _order_crossover(self, parent1: Turret,
+                         parent2: Turret) -> t.Tuple[array, array]:
+        """
+        Order crossover (OX) on slot IDs: a random segment of parent1 is kept
+        in place and the other slots are filled, starting after the segment,
+        with the remaining tools in the order they appear in parent2. The
+        offspring holds exactly the tools of parent1.
+
+        Every slot takes its life from the parent slot its tool comes from,
+        which is that of a new tool as individuals never wear their tools.
+
+        :return: The slot IDs and tool lives of the offspring.
+        """
+        ids1, ids2 = parent1.ids, parent2.ids
+        lives1, lives2 = parent1.lives, parent2.lives
+        size = len(ids1)
+        start, end = sorted(random.sample(range(size + 1), 2))
+        offspring, lives = ids1[:], lives1[:]
+
+        # Copies of every tool of ids1 outside the segment
+        remaining = self._counts
+        for i in chain(range(start), range(end, size)):
+            remaining[ids1[i]] += 1
+        left = size - (end - start)
+        slot = end % size
+        for k in range(size):
+            if not left:
+                return offspring, lives
+            j = (end + k) % size
+            tool_id = ids2[j]
+            if remaining[tool_id] > 0:
+                remaining[tool_id] -= 1
+                left -= 1
+                offspring[slot] = tool_id
+                lives[slot] = lives2[j]
+                slot = (slot + 1) % size
+
+        # Tools ids2 has fewer copies of than ids1 fill the last slots, in
+        # their order in ids1
+        for i in chain(range(start), range(end, size)):
+            tool_id = ids1[i]
+            while remaining[tool_id] > 0:
+                remaining[tool_id] -= 1
+                offspring[slot] = tool_id
+                lives[slot] = lives1[i]
+                slot = (slot + 1) % size
+        return offspring, lives
+
+    def _partially_mapped_crossover(self, parent1: Turret,
+                                    parent2: Turret) -> t.Tuple[array, array]:
+        """
+        Partially mapped crossover (PMX) on slot IDs. Copies of a tool are told
+        apart by their order of appearance, which turns both layouts into
+        permutations of the same (tool ID, copy) labels. A random segment of
+        parent1 is kept in place and every other slot takes its label from
+        parent2, following the segment's mapping while that label is already
+        taken.
+
+        A label is stored as the slot of parent1 holding that copy, so that the
+        labels of parent1 are its slot numbers and the segment is a range of
+        them. Every slot takes its life from that slot of parent1.
+
+        :return: The slot IDs and tool lives of the offspring.
+        """
+        ids1, ids2, lives1 = parent1.ids, parent2.ids, parent1.lives
+        counts = self._counts
+        for tool_id in ids1:
+            counts[tool_id] += 1
+        for tool_id in ids2:
+            counts[tool_id] -= 1
+        if any(counts[tool_id] for tool_id in self.tool_life_table):
+            for tool_id in self.tool_life_table:
+                counts[tool_id] = 0
+            raise ValueError(
+                "Parents must hold the same tools for partially mapped "
+                "crossover.")
+
+        size = len(ids1)
+        start, end = sorted(random.sample(range(size + 1), 2))
+        if len(self._slots1) != size:
+            self._slots1 = array("i", [0]) * size
+            self._slots2 = array("i", [0]) * size
+        by_tool, labels2 = self._slots1, self._slots2
+
+        # Counting sort of the slots of ids1 by tool, copies in slot order,
+        # leaving counts at the first slot of every tool in by_tool
+        for tool_id in ids1:
+            counts[tool_id] += 1
+        total = 0
+        for tool_id in self.tool_life_table:
+            total += counts[tool_id]
+            counts[tool_id] = total
+        for i in range(size - 1, -1, -1):
+            tool_id = ids1[i]
+            counts[tool_id] -= 1
+            by_tool[counts[tool_id]] = i
+        for i, tool_id in enumerate(ids2):
+            labels2[i] = by_tool[counts[tool_id]]
+            counts[tool_id] += 1
+        for tool_id in self.tool_life_table:
+            counts[tool_id] = 0
+
+        offspring, lives = ids1[:], lives1[:]
+        for i in range(size):
+            if start <= i < end:
+                continue
+            label = labels2[i]
+            while start <= label < end:
+                label = labels2[label]
+            offspring[i] = ids1[label]
+            lives[i] = lives1[label]
+        return offspring, lives
+
+    def fitness_function(self, turret: Turret) -> float:
+        """
+        Fitness function to evaluate the performance of a Turret configuration.
+
+        :param turret_array: List representing the turret configuration (slots).
+        :return: The score for the given turret configuration (lower is better).
+        """
+        # Evaluate the turret configuration based on the score function of the
+        # Turret class
+        if self.multi_start:
+            score_turret = partial(_best_start_score, turret)
+        elif self.delta:
+            score_turret = turret.traced_score
+        else:
+            # Turret.score wears the tools, score a copy to keep them new
+            score_turret = turret.copy().score
+        if self.cache is None:
+            return score_turret(self.parts, self.ops, self.cost_model)
+
+        key = self.cache.key(turret.ids, self.ops, self.tool_life_table,
+                             self.parts, self.cost_model, self.multi_start)
+        score = self.cache.get(key)
+        if score is None:
+            score = score_turret(self.parts, self.ops, self.cost_model)
+            self.cache.put(key, score)
+        return score
+
+    def evaluate_population(self, population: t.List[Turret]) -> np.ndarray:
+        """
+        Score a whole population at once, matching fitness_function for every
+        individual. Layouts found in the cache are not re-scored, and duplicate
+        layouts are scored once.
+
+        :param population: Turrets with the same number of slots.
+        :return: Scores in population order (lower is better).
+        """
+        if self.stats is None:
+            return self._evaluate_cached(population)
+
+        cache = self.cache
+        info = cache.info() if cache is not None else None
+        start = time.perf_counter()
+        scores = self._evaluate_cached(population)
+        self.stats.add("evaluation", time.perf_counter() - start)
+        if cache is None or info is None:
+            self.stats.add("evaluations", len(population))
+        else:
+            self.stats.add("cache_hits", cache.hits - info.hits)
+            self.stats.add("cache_misses", cache.misses - info.misses)
+            self.stats.add("evaluations", cache.misses - info.misses)
+        return scores
+
+    def _evaluate_cached(self, population: t.List[Turret]) -> np.ndarray:
+        """
+        evaluate_population without the instrumentation.
+        """
+        if self.workers:
+            evaluate = self._evaluate_parallel
+        elif self.delta and not self.multi_start:
+            evaluate = self._evaluate_traced
+        else:
+            evaluate = self._evaluate_batch
+        if self.cache is None:
+            return evaluate(population)
+
+        scores = np.zeros(len(population), dtype=self._score_dtype)
+        pending: t.Dict[Key, t.List[int]] = {}
+        for i, turret in enumerate(population):
+            key = self.cache.key(turret.ids, self.ops, self.tool_life_table,
+                                 self.parts, self.cost_model,
+                                 self.multi_start)
+            if key in pending:
+                pending[key].append(i)
+                continue
+            score = self.cache.get(key)
+            if score is None:
+                pending[key] = [i]
+            else:
+                scores[i] = score
+
+        if pending:
+            batch = evaluate(
+                [population[rows[0]] for rows in pending.values()])
+            for (key, rows), score in zip(pending.items(), batch.tolist(),
+                                          strict=True):
+                self.cache.put(key, score)
+                scores[rows] = score
+        return scores
+
+    def _evaluate_batch(self, population: t.List[Turret]) -> np.ndarray:
+        """
+        Vectorized scoring of a population, without the cache.
+
+        Slot IDs are packed into a (population x slots) matrix and all
+        individuals step through the operations together, picking the nearest
+        slot of each tool with one argmin per operation. Turret.score never
+        retires worn tools, so every part follows the same path and the score is
+        parts times the path of one part, or 0 when a tool is missing from the
+        turret.
+
+        In multi-start mode every (individual, start slot) pair is a row of
+        its own, and each individual keeps the shortest path of its rows.
+        With a cost model, moves are priced by a lookup in its matrix in place
+        of the distance matrix.
+        """
+        ids = np.stack([np.frombuffer(turret.ids, dtype=np.intc)
+                        for turret in population])
+        count, size = ids.shape
+        steps = [self.ops[0]] + self.ops
+        # Individual of every row, and the slot each row starts from
+        individuals = np.arange(count)
+        current = np.zeros(count, dtype=np.intp)
+        if self.multi_start:
+            # One row per slot holding the first tool, starting from that slot
+            individuals, current = np.nonzero(ids == self.ops[0])
+            ids = ids[individuals]
+
+        # Ring distances between every start slot (row) and target slot (column),
+        # with a lookup order of nearest first, clockwise before anticlockwise
+        cw = (np.arange(size)[None, :] - np.arange(size)[:, None]) % size
+        distance = np.minimum(cw, size - cw)
+        order = 2 * distance + (cw > size - cw)
+        absent = 2 * size
+        move_cost = distance if self.cost_model is None else self.cost_model.matrix
+
+        rows = np.arange(len(ids))
+        path = np.zeros(len(ids), dtype=self._score_dtype)
+        found = np.ones(len(ids), dtype=bool)
+
+        # Each part starts at the ops[0] slot nearest to index 0, or at the
+        # row's start slot, and pays for staying there to serve ops[0]
+        for step, tool_id in enumerate(steps):
+            candidates = np.where(ids == tool_id, order[current], absent)
+            nearest = candidates.argmin(axis=1)
+            found &= candidates[rows, nearest] < absent
+            if step:
+                path += move_cost[current, nearest]
+            current = nearest
+
+        if self.multi_start:
+            shortest = np.full(count, np.inf)
+            np.minimum.at(shortest, individuals[found], path[found])
+            path = np.where(np.isfinite(shortest), shortest,
+                            0).astype(self._score_dtype)
+            found = np.ones(count, dtype=bool)
+        return np.where(found, max(self.parts, 0) * path, 0)
+
+    def _evaluate_traced(self, population: t.List[Turret]) -> np.ndarray:
+        """
+        Score a population turret by turret with Turret.traced_score, without
+        the cache.
+        """
+        return np.array([
+            turret.traced_score(self.parts, self.ops, self.cost_model)
+            for turret in population
+        ],
+                        dtype=self._score_dtype)
+
+    def _evaluate_parallel(self, population: t.List[Turret]) -> np.ndarray:
+        """
+        Score a population with Turret.traced_score in the worker pool,
+        without the cache. Only the slot ID buffers are sent to the workers, in
+        chunks, and the scores come back in population order whatever the
+        number of workers.
+        """
+        if self._pool is None:
+            # Imported on first use, it pulls in multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+
+        chunksize = self.chunksize or max(
+            1, math.ceil(len(population) / (4 * self.workers)))
+        chunks = [[turret.ids for turret in population[i:i + chunksize]]
+                  for i in range(0, len(population), chunksize)]
+        score_layouts = partial(_score_layouts,
+                                ops=self.ops,
+                                tool_life_table=self.tool_life_table,
+                                parts=self.parts,
+                                multi_start=self.multi_start,
+                                cost=self.cost_model)
+
+        scores = np.zeros(len(population), dtype=self._score_dtype)
+        start = 0
+        for chunk_scores in self._pool.map(score_layouts, chunks):
+            scores[start:start + len(chunk_scores)] = chunk_scores
+            start += len(chunk_scores)
+        return scores
+
+    def create_initial_population(self, size: int,
+                                  djkParent: t.List[int]) -> t.List[Turret]:
+        """
+        Create the initial population for the genetic algorithm.
+
+        :param size: The number of individuals in the population.
+        :param djkParent: A base list representing the parent configuration.
+        :return: A list of individuals (population), each being a shuffled version of 
+        the parent configuration.
+        """
+        parent: Turret = Turret(djkParent, self.tool_life_table)
+        if self.stats is not None:
+            parent.stats = self.stats.turret
+        population: t.List[Turret] = [parent]
+
+        for _ in range(size):
+            # Shuffle the parent configuration to create a new individual
+            order: t.List[int] = sorted(range(parent.size),
+                                        key=lambda _: random.random())
+            population.append(
+                Turret.from_buffers(array("i", [parent.ids[i] for i in order]),
+                                    array("i",
+                                          [parent.lives[i] for i in order]),
+                                    parent.stats))
+
+        if self.multi_start:
+            population = [
+                turret.rotated(least_rotation(turret.ids))
+                for turret in population
+            ]
+        return population
+
+    def repair(self, turret: Turret,
+               expected_tool_distribution: t.Dict[int, int]) -> Turret:
+        """
+        Repair function to fix the tool distribution in a Turret after crossover. 
+        Ensures that the number of each tool matches the expected distribution.
+        In multi-start mode the repaired turret is also turned to its least
+        rotation.
+
+        :param turret: The Turret instance to be repaired.
+        :param expected_tool_distribution: A dictionary mapping tool ID to the expected 
+        count.
+        :return: Repaired Turret instance with corrected tool distribution.
+        """
+        # Copies of every tool beyond its expected count (negative: missing
+        # copies), in the per-tool counts left zeroed after use
+        counts = self._counts
+        for tool_id in turret.ids:
+            counts[tool_id] += 1
+        missing = 0
+        unexpected = turret.size  # Slots holding tools not expected at all
+        for tool_id, expected_count in expected_tool_distribution.items():
+            count = counts[tool_id]
+            unexpected -= count
+            counts[tool_id] = count - expected_count
+            if count < expected_count:
+                missing += expected_count - count
+
+        if missing:
+            # Replace the first surplus copies of every tool with missing
+            # tools, in the order of the expected distribution and fitted
+            # with a new life, until no tool is missing
+            missing_tools = iter(expected_tool_distribution)
+            new_tool_id = next(missing_tools)
+            for i, tool_id in enumerate(turret.ids):
+                if not missing:
+                    break
+                if counts[tool_id] > 0:
+                    while counts[new_tool_id] >= 0:
+                        new_tool_id = next(missing_tools)
+                    counts[tool_id] -= 1
+                    counts[new_tool_id] += 1
+                    missing -= 1
+                    turret.set_slot(i, new_tool_id)
+                    turret.lives[i] = self.tool_life_table[new_tool_id]
+
+        for tool_id in expected_tool_distribution:
+            counts[tool_id] = 0
+        if unexpected:
+            for tool_id in turret.ids:
+                counts[tool_id] = 0
+
+        if self.multi_start:
+            return turret.rotated(least_rotation(turret.ids))
+        return turret
+
+    def mutate(self, turret: Turret, mutation_rate: float = 0.01) -> Turret:
+        """
+        Mutates a given Turret by swapping two tools or changing a tool at a random 
+        position
+        based on the mutation rate.
+
+        :param turret: The Turret instance to be mutated.
+        :param mutation_rate: The probability of mutation for each tool in the turret 
+        array (default is 1%).
+        :return: A new Turret instance with the mutation applied.
+        """
+        # Copy the turret's buffers to apply mutations
+        offspring: Turret = turret.copy()
+
+        # Apply mutation based on mutation rate
+        for i in range(offspring.size):
+            if random.random() < mutation_rate:
+                # Randomly decide the type of mutation: swap or replace a tool
+                if random.random() < 0.5:
+                    # Mutation Type 1: Swap this tool with another random tool
+                    swap_idx = random.randint(0, offspring.size - 1)
+                    offspring.swap(i, swap_idx)
+                else:
+                    # Mutation Type 2: Replace the tool with a new random tool from the
+                    # valid set
+                    new_tool_id = random.choice(
+                        list(self.tool_life_table.keys()))
+                    offspring.set_slot(i, new_tool_id)
+                    offspring.lives[i] = self.tool_life_table[new_tool_id]
+
+        return offspring
+
+    def diversity(self, population: t.List[Turret]) -> float:
+        """
+        Share of the population's slots that differ from the most common tool
+        of their slot index: 0 when all individuals are the same layout.
+        """
+        ids = np.stack([np.frombuffer(turret.ids, dtype=np.intc)
+                        for turret in population])
+        modal = np.zeros(ids.shape[1], dtype=np.intp)
+        for tool_id in np.unique(ids).tolist():
+            np.maximum(modal, (ids == tool_id).sum(axis=0), out=modal)
+        return 1 - modal.mean() / len(ids)
+
+    def adaptive_mutation_rate(self, population: t.List[Turret],
+                               distr: t.Dict[int, int], mutation_rate: float,
+                               max_mutation_rate: float) -> float:
+        """
+        Mutation rate for breeding from a population, rising from mutation_rate
+        towards max_mutation_rate as the population loses its diversity.
+
+        A shuffled population such as the initial one has about the diversity
+        of a slot that holds each tool with the distr frequencies; that, or
+        more, gives mutation_rate, and a population of one layout gives
+        max_mutation_rate.
+        """
+        shuffled = 1 - max(distr.values()) / sum(distr.values())
+        spread = 1.0
+        if shuffled:
+            spread = min(1.0, self.diversity(population) / shuffled)
+        return max_mutation_rate - (max_mutation_rate - mutation_rate) * spread
+
+    def next_generation(self,
+                        population: t.List[Turret],
+                        distr: t.Dict[int, int],
+                        size: int,
+                        mutation_rate: float = 0.01,
+                        elites: int = 0,
+                        scores: t.Optional[np.ndarray] = None) -> t.List[Turret]:
+        """
+        Breed the next generation: selection, then crossover, mutation and repair
+        of random parent pairs until the population is full.
+
+        :param population: Current population.
+        :param distr: Expected number of slots per tool ID, used by repair.
+        :param size: Size of the new population.
+        :param mutation_rate: Mutation rate passed to mutate.
+        :param elites: Number of best individuals carried over unchanged.
+        :param scores: Scores of the population, if already evaluated.
+        :return: The new population.
+        """
+        if scores is None:
+            scores = self.evaluate_population(population)
+        if self.stats is None:
+            parents = self.selection(population, scores)
+        else:
+            start = time.perf_counter()
+            parents = self.selection(population, scores)
+            self.stats.add("selection", time.perf_counter() - start)
+
+        new_population: t.List[Turret] = [
+            population[i] for i in scores.argsort(kind="stable")[:elites]
+        ]
+        while len(new_population) < size:
+            parent1, parent2 = random.sample(parents, 2)
+            new_population.append(
+                self._breed(parent1, parent2, distr, mutation_rate))
+
+        return new_population
+
+    def _breed(self, parent1: Turret, parent2: Turret,
+               distr: t.Dict[int, int], mutation_rate: float) -> Turret:
+        """
+        Crossover, mutation and repair of one offspring.
+        """
+        if self.stats is not None:
+            return self._breed_timed(parent1, parent2, distr, mutation_rate)
+        offspring = self.crossover(parent1, parent2)
+        offspring = self.mutate(offspring, mutation_rate)
+        return self.repair(offspring, distr)
+
+    def _breed_timed(self, parent1: Turret, parent2: Turret,
+                     distr: t.Dict[int, int], mutation_rate: float) -> Turret:
+        """
+        Crossover, mutation and repair of one offspring, timing each step into
+        self.stats.
+        """
+        assert self.stats is not None
+        start = time.perf_counter()
+        offspring = self.crossover(parent1, parent2)
+        crossed = time.perf_counter()
+        offspring = self.mutate(offspring, mutation_rate)
+        mutated = time.perf_counter()
+        offspring = self.repair(offspring, distr)
+        repaired = time.perf_counter()
+
+        self.stats.add("crossover", crossed - start)
+        self.stats.add("mutate", mutated - crossed)
+        self.stats.add("repair", repaired - mutated)
+        return offspring
+
+    def run(self,
+            generations: int,
+            population_size: int,
+            djkParent: t.List[int],
+            distr: t.Dict[int, int],
+            mutation_rate: float = 0.01,
+            elites: int = 1,
+            patience: t.Optional[int] = None,
+            time_budget: t.Optional[float] = None,
+            lower_bound: t.Optional[int] = None,
+            max_mutation_rate: t.Optional[float] = None,
+            callback: t.Optional[t.Callable[[int, t.List[Turret], np.ndarray],
+                                            None]] = None,
+            profile: t.Optional[str] = None,
+            checkpoint: t.Optional[str] = None,
+            checkpoint_interval: int = 10,
+            resume: bool = False) -> GAResult:
+        """
+        Run the genetic algorithm from a population shuffled from djkParent.
+
+        :param generations: Maximum number of generations.
+        :param population_size: Number of individuals per generation.
+        :param djkParent: Base layout the initial population is shuffled from.
+        :param distr: Expected number of slots per tool ID, used by repair.
+        :param mutation_rate: Mutation rate passed to mutate.
+        :param elites: Number of best individuals kept in every generation.
+        :param patience: Stop after this many generations without improving the
+        best score.
+        :param time_budget: Stop after the generation that exceeds this many
+        seconds of wall-clock time.
+        :param lower_bound: Stop once the best score reaches this bound, e.g.
+        solver.BranchAndBound.lower_bound(), since no layout can do better.
+        :param max_mutation_rate: Adapt the mutation rate of every generation
+        to the diversity of its parents' population (see
+        adaptive_mutation_rate), between mutation_rate and this rate.
+        :param callback: Called with (generation, population, scores) for the
+        initial population (generation 0) and after every generation.
+        :param profile: Run under cProfile and write its statistics to this
+        file, to be read with pstats.
+        :param checkpoint: Save the state of the run (population, scores, best
+        layout, random state and fitness cache) to this file every
+        checkpoint_interval generations and when the run stops.
+        :param checkpoint_interval: Generations between checkpoints.
+        :param resume: Continue from the checkpoint file, if it exists, instead
+        of creating an initial population. The generation count and patience
+        carry over; time_budget counts from the resume.
+        :return: The best layout found and the run's history.
+        """
+        if profile is not None:
+            import cProfile
+            profiler = cProfile.Profile()
+            result = profiler.runcall(self.run,
+                                      generations,
+                                      population_size,
+                                      djkParent,
+                                      distr,
+                                      mutation_rate=mutation_rate,
+                                      elites=elites,
+                                      patience=patience,
+                                      time_budget=time_budget,
+                                      lower_bound=lower_bound,
+                                      max_mutation_rate=max_mutation_rate,
+                                      callback=callback,
+                                      checkpoint=checkpoint,
+                                      checkpoint_interval=checkpoint_interval,
+                                      resume=resume)
+            profiler.dump_stats(profile)
+            return result
+
+        start = time.monotonic()
+        if resume and checkpoint is not None and os.path.exists(checkpoint):
+            state = ga_checkpoint.load(checkpoint)
+            population = self._restore(state)
+            scores = np.array(state.scores)
+            best_layout = state.best_layout
+            best_score = state.best_score
+            history = state.history
+            stale = state.stale
+            generation = state.generation
+        else:
+            population = self.create_initial_population(
+                population_size, djkParent)
+            scores = self.evaluate_population(population)
+            if callback is not None:
+                callback(0, population, scores)
+
+            best_idx = int(scores.argmin())
+            best_layout = self._layout(population[best_idx])
+            best_score = scores[best_idx].item()
+            history = [best_score]
+            stale = 0
+            generation = 0
+        stop_reason = "generations"
+
+        while generation < generations:
+            if lower_bound is not None and best_score <= lower_bound:
+                stop_reason = "bound"
+                break
+            generation += 1
+            if self.stats is not None:
+                self.stats.generations.append({})
+            rate = mutation_rate
+            if max_mutation_rate is not None:
+                rate = self.adaptive_mutation_rate(population, distr,
+                                                   mutation_rate,
+                                                   max_mutation_rate)
+                if self.stats is not None:
+                    self.stats.generations[-1]["mutation_rate"] = rate
+            population = self.next_generation(population, distr,
+                                              population_size, rate, elites,
+                                              scores)
+            scores = self.evaluate_population(population)
+            if callback is not None:
+                callback(generation, population, scores)
+
+            best_idx = int(scores.argmin())
+            history.append(scores[best_idx].item())
+            if history[-1] < best_score:
+                best_layout = self._layout(population[best_idx])
+                best_score = history[-1]
+                stale = 0
+            else:
+                stale += 1
+
+            if checkpoint is not None and generation % checkpoint_interval == 0:
+                ga_checkpoint.save(
+                    checkpoint,
+                    self._snapshot(generation, population, scores, best_layout,
+                                   best_score, history, stale))
+
+            if patience is not None and stale >= patience:
+                stop_reason = "plateau"
+                break
+            if time_budget is not None and time.monotonic() - start >= time_budget:
+                stop_reason = "time"
+                break
+
+        if checkpoint is not None:
+            ga_checkpoint.save(
+                checkpoint,
+                self._snapshot(generation, population, scores, best_layout,
+                               best_score, history, stale))
+
+        return GAResult(best_layout, best_score, generation, history,
+                        stop_reason)
+
+    def _layout(self, turret: Turret) -> t.List[int]:
+        """
+        Tool IDs of a turret as a result layout, in multi-start mode turned so
+        that Turret.score starts from its best start slot.
+        """
+        if self.multi_start:
+            best = turret.best_start(self.parts, self.ops, self.cost_model)
+            if best is not None:
+                return list(turret.rotated(best[0]).ids)
+        return list(turret.ids)
+
+    def _snapshot(self, generation: int, population: t.List[Turret],
+                  scores: np.ndarray, best_layout: t.List[int],
+                  best_score: float, history: t.List[float],
+                  stale: int) -> Checkpoint:
+        """
+        Checkpoint of a run after the given generation, with the population
+        packed into int arrays. Only the cache entries of this GA's job are
+        kept.
+        """
+        cache: t.Optional[t.Dict[str, t.Any]] = None
+        layouts: t.List[t.Tuple[int, ...]] = []
+        cached: t.List[float] = []
+        if self.cache is not None:
+            cache = {
+                "maxsize": self.cache.maxsize,
+                "rotations": self.cache.rotations,
+                "multi_start": self.multi_start,
+                "hits": self.cache.hits,
+                "misses": self.cache.misses,
+                "evictions": self.cache.evictions,
+            }
+            job = self._cache_job()
+            for key, score in self.cache.items():
+                if key[1:] == job and len(key[0]) == population[0].size:
+                    layouts.append(key[0])
+                    cached.append(score)
+
+        return Checkpoint(
+            generation=generation,
+            ids=np.stack([np.frombuffer(turret.ids, dtype=np.intc)
+                          for turret in population]),
+            lives=np.stack([np.frombuffer(turret.lives, dtype=np.intc)
+                            for turret in population]),
+            scores=scores,
+            best_layout=best_layout,
+            best_score=best_score,
+            history=history,
+            stale=stale,
+            random_state=random.getstate(),
+            cache=cache,
+            cache_layouts=np.array(layouts, dtype=np.int32).reshape(
+                len(layouts), population[0].size),
+            cache_scores=np.array(cached, dtype=self._score_dtype),
+        )
+
+    def _restore(self, state: Checkpoint) -> t.List[Turret]:
+        """
+        Restore the random state and the fitness cache of a checkpoint.
+
+        :return: The checkpoint's population.
+        """
+        random.setstate(state.random_state)
+
+        if (self.cache is not None and state.cache is not None
+                and self.cache.rotations == state.cache["rotations"]
+                and self.multi_start == state.cache.get("multi_start", False)):
+            job = self._cache_job()
+            for layout, score in zip(state.cache_layouts.tolist(),
+                                     state.cache_scores.tolist(),
+                                     strict=True):
+                self.cache.put((tuple(layout), ) + job, score)
+            self.cache.hits = state.cache["hits"]
+            self.cache.misses = state.cache["misses"]
+            self.cache.evictions = state.cache["evictions"]
+
+        stats = self.stats.turret if self.stats is not None else None
+        return [
+            Turret.from_buffers(array("i", ids.tobytes()),
+                                array("i", lives.tobytes()), stats)
+            for ids, lives in zip(state.ids, state.lives, strict=True)
+        ]
+
+    def _cache_job(self) -> Key:
+        """
+        The part of this GA's cache keys that does not depend on the layout.
+        """
+        assert self.cache is not None
+        return self.cache.key((), self.ops, self.tool_life_table, self.parts,
+                              self.cost_model, self.multi_start)[1:]
@@ -0,0 +1,189 @@
+import multiprocessing
+import random
+import typing as t
+from array import array
+from dataclasses import dataclass, field
+from multiprocessing.connection import Connection
+
+from .fitness_cache import FitnessCache
+from .genetic_algorithm import GA
+from .turret import Turret
+
+TOPOLOGIES = ("ring", "full")
+
+
+@dataclass
+class IslandResult:
+    island: int  # Island that found the best layout
+    layout: t.List[int]  # Best tool arrangement
+    score: float  # Score of the best layout (lower is better)
+    history: t.List[t.List[float]] = field(
+        default_factory=list)  # Best score per generation, per island
+
+
+def _sources(island: int, islands: int, topology: str) -> t.List[int]:
+    """
+    Islands that send their migrants to the given island.
+    """
+    if islands < 2:
+        return []
+    if topology == "ring":
+        return [(island - 1) % islands]
+    return [other for other in range(islands) if other != island]
+
+
+def _island(conn: Connection, seed: int, ga_kwargs: t.Dict[str, t.Any],
+            cache_size: int, djkParent: t.List[int],
+            distr: t.Dict[int, int], population_size: int,
+            mutation_rate: float, elites: int, generations: int,
+            interval: int, migrants: int) -> None:
+    """
+    Worker process running one island. Every interval generations it sends its
+    best migrants to the coordinator over conn and replaces its worst
+    individuals with the layouts it gets back.
+    """
+    random.seed(seed)
+    ga = GA(**ga_kwargs,
+            cache=FitnessCache(cache_size) if cache_size else None)
+    population = ga.create_initial_population(population_size, djkParent)
+    scores = ga.evaluate_population(population)
+    history: t.List[float] = []
+
+    for generation in range(1, generations + 1):
+        population = ga.next_generation(population, distr, population_size,
+                                        mutation_rate, elites, scores)
+        scores = ga.evaluate_population(population)
+        ranking = scores.argsort(kind="stable")
+        history.append(scores[ranking[0]].item())
+
+        if generation % interval == 0 and generation < generations:
+            conn.send([population[i].ids for i in ranking[:migrants]])
+            immigrants: t.List[array] = conn.recv()
+            # Immigrants replace the worst individuals, with fresh tools, and
+            # never the elites
+            replaceable = ranking[elites:][::-1]
+            for i, ids in zip(replaceable, immigrants, strict=False):
+                population[i] = Turret(ids, ga.tool_life_table)
+            scores = ga.evaluate_population(population)
+
+    best = population[int(scores.argmin())]
+    conn.send((list(best.ids), history[-1], history))
+    conn.close()
+
+
+class IslandModel:
+
+    def __init__(self,
+                 U: int,
+                 ops: t.List[int],
+                 tool_life_table: t.Dict[int, int],
+                 distr: t.Dict[int, int],
+                 islands: int = 4,
+                 population_size: int = 100,
+                 mutation_rate: float = 0.05,
+                 elites: int = 1,
+                 migration_interval: int = 10,
+                 migrants: int = 2,
+                 topology: str = "ring",
+                 seed: int = 0,
+                 seeds: t.Optional[t.List[int]] = None,
+                 parts: int = 300,
+                 cache_size: int = 4096) -> None:
+        """
+        Island-model GA: independent populations evolve in separate processes
+        and exchange their best layouts every few generations.
+
+        :param U: Number of individuals each island selects for breeding.
+        :param ops: List of tool operations to perform.
+        :param tool_life_table: Dictionary mapping tool ID to tool life.
+        :param distr: Expected number of slots per tool ID, used by repair.
+        :param islands: Number of islands (one process each).
+        :param population_size: Individuals per island.
+        :param mutation_rate: Mutation rate passed to GA.mutate.
+        :param elites: Best individuals each island keeps every generation.
+        :param migration_interval: Generations between migrations.
+        :param migrants: Number of best layouts each island sends per migration.
+        :param topology: "ring" (each island sends to the next one) or "full"
+        (each island sends to all the others).
+        :param seed: Base seed; island i uses seed + i unless seeds is given.
+        :param seeds: Explicit seed per island.
+        :param parts: Number of parts each turret is scored on.
+        :param cache_size: Size of each island's fitness cache (0 disables it).
+        """
+        if topology not in TOPOLOGIES:
+            raise ValueError(
+                f"Unknown topology {topology!r}, expected one of {TOPOLOGIES}")
+        if seeds is not None and len(seeds) != islands:
+            raise ValueError("Expected one seed per island.")
+
+        self.ga_kwargs: t.Dict[str, t.Any] = {
+            "U": U,
+            "ops": ops,
+            "tool_life_table": tool_life_table,
+            "parts": parts,
+        }
+        self.distr: t.Dict[int, int] = distr
+        self.islands: int = islands
+        self.population_size: int = population_size
+        self.mutation_rate: float = mutation_rate
+        self.elites: int = elites
+        self.migration_interval: int = migration_interval
+        self.migrants: int = migrants
+        self.topology: str = topology
+        self.seeds: t.List[int] = (list(seeds) if seeds is not None else
+                                   [seed + i for i in range(islands)])
+        self.cache_size: int = cache_size
+
+    def run(self, generations: int, djkParent: t.List[int]) -> IslandResult:
+        """
+        Evolve all islands for the given number of generations.
+
+        Migration is synchronous: every island sends its migrants, then receives
+        those of its source islands, so a run is reproducible from its seeds.
+
+        :param generations: Number of generations per island.
+        :param djkParent: Base layout every initial population is shuffled from.
+        :return: The best layout over all islands and every island's history.
+        """
+        if generations < 1:
+            raise ValueError("At least one generation is required.")
+
+        context = multiprocessing.get_context()
+        conns: t.List[Connection] = []
+        processes = []
+        for seed in self.seeds:
+            conn, child_conn = context.Pipe()
+            process = context.Process(
+                target=_island,
+                args=(child_conn, seed, self.ga_kwargs, self.cache_size,
+                      djkParent, self.distr, self.population_size,
+                      self.mutation_rate, self.elites, generations,
+                      self.migration_interval, self.migrants),
+                daemon=True)
+            process.start()
+            child_conn.close()
+            conns.append(conn)
+            processes.append(process)
+
+        try:
+            for _ in range((generations - 1) // self.migration_interval):
+                outgoing = [conn.recv() for conn in conns]
+                for island, conn in enumerate(conns):
+                    conn.send([
+                        ids for source in _sources(island, self.islands,
+                                                   self.topology)
+                        for ids in outgoing[source]
+                    ])
+            results = [conn.recv() for conn in conns]
+        except BaseException:
+            for process in processes:
+                process.terminate()
+            raise
+        finally:
+            for process in processes:
+                process.join()
+
+        island = min(range(self.islands), key=lambda i: results[i][1])
+        layout, score, _ = results[island]
+        return IslandResult(island, layout, score,
+                            [history for _, _, history in results])
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import json
+import typing as t
+from dataclasses import asdict, dataclass, is_dataclass
+from pathlib import Path
+
+from .compat import PartRecord, RetiringTurret, TraceSink
+
+SCENARIOS_PATH = Path(__file__).parent / "data" / "turrets.json"
+
+
+class JsonLinesTrace:
+    def __init__(
+        self, file: t.Union[str, Path, t.TextIO], buffering: int = 1 << 16
+    ) -> None:
+        """
+        Trace sink writing every event as one line of JSON.
+
+        :param file: Path to open for writing, or an open text stream.
+        :param buffering: Buffer size used when opening a path.
+        """
+        if isinstance(file, (str, Path)):
+            # Owned streams are closed by close, or on leaving a with block
+            self.stream: t.TextIO = open(file, "w", buffering=buffering)  # noqa: SIM115
+            self._owned = True
+        else:
+            self.stream = file
+            self._owned = False
+
+    def __call__(self, event: t.Any) -> None:
+        if is_dataclass(event) and not isinstance(event, type):
+            event = asdict(event)
+        self.stream.write(json.dumps(event))
+        self.stream.write("\n")
+
+    def __enter__(self) -> JsonLinesTrace:
+        return self
+
+    def __exit__(self, *exc_info: t.Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Flush the stream, and close it if it was opened from a path.
+        """
+        if self._owned:
+            self.stream.close()
+        else:
+            self.stream.flush()
+
+
+@dataclass
+class Scenario:
+    allocation: t.List[int]  # Tool ID per slot
+    operations: t.List[int]  # Tool ID per operation, in order
+    parts: int  # Number of parts to machine
+    data: t.Dict[int, int]  # Tool life per tool ID
+
+    @classmethod
+    def from_dict(cls, raw: t.Dict[str, t.Any]) -> Scenario:
+        return cls(
+            allocation=list(raw["allocation"]),
+            operations=list(raw["operations"]),
+            parts=int(raw["parts"]),
+            data={int(tool_id): int(life) for tool_id, life in raw["data"].items()},
+        )
+
+    @property
+    def point(self) -> int:
+        """
+        First slot holding the tool of the first operation, where scoring starts.
+        """
+        return self.allocation.index(self.operations[0])
+
+    def turret(self) -> RetiringTurret:
+        """
+        New turret of the scenario, scored the way scenarios are: worn tools
+        are retired (see compat).
+        """
+        return RetiringTurret(self.allocation, self.data)
+
+    def score(self, trace: t.Optional[TraceSink] = None) -> int:
+        return self.turret().score(self.parts, self.operations, self.point, trace)
+
+    def simulate(self, fast_forward: bool = True) -> t.Iterator[PartRecord]:
+        return self.turret().simulate(
+            self.parts, self.operations, self.point, fast_forward
+        )
+
+    def best_start(self) -> t.Optional[t.Tuple[int, int]]:
+        """
+        (start slot, score) of the best start point, see RetiringTurret.best_start.
+        """
+        return self.turret().best_start(self.parts, self.operations)
+
+
+def load_scenarios(path: t.Union[str, Path] = SCENARIOS_PATH) -> t.Dict[str, Scenario]:
+    """
+    Load named scenarios from a JSON file shaped like data/turrets.json.
+    """
+    with open(path) as f:
+        return {name: Scenario.from_dict(raw) for name, raw in json.load(f).items()}
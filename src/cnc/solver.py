@@ -0,0 +1,197 @@
+import time
+import typing as t
+from dataclasses import dataclass
+from itertools import pairwise
+
+import numpy as np
+
+from .turret import Turret
+
+FREE = -1  # Marks a slot the branch and bound has not assigned yet
+
+
+@dataclass
+class SolverResult:
+    layout: t.List[int]  # Best tool arrangement found
+    score: float  # Its score (lower is better)
+    lower_bound: float  # No layout scores below this
+    optimal: bool  # Whether the search finished, proving score optimal
+    nodes: int  # Search nodes expanded
+
+
+def optimal_plan(turret: Turret,
+                 ops: t.List[int]) -> t.Optional[t.Tuple[int, t.List[int]]]:
+    """
+    Cheapest way to serve the operations of one part on a fixed layout: a
+    shortest path through Turret.create_layered_graph, starting from any slot
+    holding ops[0].
+
+    Turret.score never retires worn tools, so remaining tool life does not
+    constrain the plan and every part can follow the same one.
+
+    :return: (path length, slot index per operation), or None if a tool of the
+    operations is missing from the turret.
+    """
+    graph = turret.create_layered_graph(ops)
+    cost: t.Dict[int, int] = {idx: 0 for layer, idx in graph if layer == 0}
+    back: t.List[t.Dict[int, int]] = []
+
+    for layer in range(len(ops) - 1):
+        next_cost: t.Dict[int, int] = {}
+        prev: t.Dict[int, int] = {}
+        for idx, path in cost.items():
+            for next_idx, distance in graph[(layer, idx)]:
+                length = path + abs(distance)
+                if next_idx not in next_cost or length < next_cost[next_idx]:
+                    next_cost[next_idx] = length
+                    prev[next_idx] = idx
+        cost = next_cost
+        back.append(prev)
+
+    if not cost:
+        return None
+    idx = min(cost, key=lambda i: cost[i])
+    length = cost[idx]
+    plan = [idx]
+    for prev in reversed(back):
+        idx = prev[idx]
+        plan.append(idx)
+    plan.reverse()
+    return length, plan
+
+
+class BranchAndBound:
+
+    def __init__(self,
+                 ops: t.List[int],
+                 tool_life_table: t.Dict[int, int],
+                 distr: t.Dict[int, int],
+                 parts: int = 300) -> None:
+        """
+        Exact layout search for the GA objective (GA.fitness_function): slots
+        are assigned one at a time and a branch is dropped as soon as a lower
+        bound on all of its completions reaches the best score found.
+
+        The bound is parts times a shortest-path DP over (operation, slot) in
+        which every unassigned slot may serve any tool that still has copies to
+        place, apart from serving two different consecutive operations from the
+        same slot. For a complete layout it is exactly optimal_plan, which
+        Turret.score's nearest-tool walk can never beat.
+
+        :param ops: List of tool operations to perform.
+        :param tool_life_table: Dictionary mapping tool ID to tool life.
+        :param distr: Number of slots per tool ID; the turret has
+        sum(distr.values()) slots.
+        :param parts: Number of parts each layout is scored on.
+        """
+        missing = sorted(set(ops) - {tool for tool, n in distr.items() if n > 0})
+        if missing:
+            raise ValueError(f"Tools {missing} of the operations have no slots.")
+
+        self.ops: t.List[int] = ops
+        self.tool_life_table: t.Dict[int, int] = tool_life_table
+        self.distr: t.Dict[int, int] = distr
+        self.parts: int = parts
+        self.size: int = sum(distr.values())
+
+        cw = (np.arange(self.size)[None, :] -
+              np.arange(self.size)[:, None]) % self.size
+        self._distance = np.minimum(cw, self.size - cw).astype(float)
+        # Different tools never share a slot
+        self._distinct = self._distance.copy()
+        np.fill_diagonal(self._distinct, np.inf)
+
+    def score(self, layout: t.Sequence[int]) -> float:
+        """
+        GA objective of a complete layout.
+        """
+        return Turret(list(layout),
+                      self.tool_life_table).traced_score(self.parts, self.ops)
+
+    def lower_bound(self,
+                    layout: t.Optional[t.Sequence[int]] = None) -> int:
+        """
+        Lower bound on the score of every completion of a partial layout.
+
+        :param layout: Tool ID per slot, FREE for unassigned slots (default: an
+        empty turret, which bounds every layout).
+        """
+        ids = np.full(self.size, FREE) if layout is None else np.asarray(layout)
+        remaining = dict(self.distr)
+        for tool_id in ids[ids != FREE].tolist():
+            remaining[tool_id] -= 1
+        return self._bound(ids, remaining)
+
+    def _bound(self, ids: np.ndarray, remaining: t.Dict[int, int]) -> int:
+        free = ids == FREE
+
+        def holds(tool_id: int) -> np.ndarray:
+            return (ids == tool_id) | (free if remaining.get(tool_id) else False)
+
+        cost = np.where(holds(self.ops[0]), 0.0, np.inf)
+        for prev, tool_id in pairwise(self.ops):
+            step = self._distance if tool_id == prev else self._distinct
+            cost = (cost[:, None] + step).min(axis=0)
+            cost[~holds(tool_id)] = np.inf
+        return self.parts * int(cost.min())
+
+    def solve(self,
+              incumbent: t.Optional[t.Sequence[int]] = None,
+              node_limit: t.Optional[int] = None,
+              time_limit: t.Optional[float] = None) -> SolverResult:
+        """
+        Depth-first branch and bound over all layouts with the distr tool
+        counts, exploring the children with the lowest bound first.
+
+        :param incumbent: Known layout to start from, e.g. a GA result; prunes
+        from the first node on.
+        :param node_limit: Stop after expanding this many nodes.
+        :param time_limit: Stop after this many seconds.
+        :return: The best layout found. If the search finished it is optimal;
+        otherwise lower_bound is the smallest bound left unexplored.
+        """
+        start = time.monotonic()
+        best_layout = list(incumbent) if incumbent is not None else []
+        best_score = (self.score(best_layout)
+                      if incumbent is not None else np.iinfo(np.int64).max)
+
+        root = np.full(self.size, FREE)
+        stack = [(self._bound(root, self.distr), 0, root, dict(self.distr))]
+        nodes = 0
+        while stack:
+            if ((node_limit is not None and nodes >= node_limit)
+                    or (time_limit is not None
+                        and time.monotonic() - start >= time_limit)):
+                lower_bound = min([best_score] + [bound for bound, *_ in stack])
+                return SolverResult(best_layout, int(best_score),
+                                    int(lower_bound), False, nodes)
+
+            bound, depth, ids, remaining = stack.pop()
+            if bound >= best_score:
+                continue
+            nodes += 1
+
+            if depth == self.size:
+                score = self.score(ids.tolist())
+                if score < best_score:
+                    best_layout, best_score = ids.tolist(), score
+                continue
+
+            children = []
+            for tool_id in sorted(remaining):
+                if not remaining[tool_id]:
+                    continue
+                child = ids.copy()
+                child[depth] = tool_id
+                child_remaining = dict(remaining)
+                child_remaining[tool_id] -= 1
+                child_bound = self._bound(child, child_remaining)
+                if child_bound < best_score:
+                    children.append(
+                        (child_bound, depth + 1, child, child_remaining))
+            # Lowest bound on top of the stack
+            children.sort(key=lambda child: -child[0])
+            stack.extend(children)
+
+        return SolverResult(best_layout, int(best_score), int(best_score), True,
+                            nodes)
@@ -0,0 +1,587 @@
+from __future__ import annotations
+
+import typing as t
+from array import array
+from bisect import bisect_left
+from dataclasses import dataclass
+from itertools import pairwise
+
+if t.TYPE_CHECKING:
+    from .cost_model import CostModel
+
+Trace = t.List[t.Tuple[int, int]]
+
+
+@dataclass
+class TurretStats:
+    finds: int = 0  # Nearest-slot lookups
+    scanned: int = 0  # Ring positions or tool occurrences examined by lookups
+    wear_outs: int = 0  # Tool uses that left the tool without life
+    parts_simulated: int = 0  # Parts RetiringTurret scored by walking their path
+    parts_skipped: int = 0  # Parts it added in one step by the steady state
+
+
+def least_rotation(ids: t.Sequence[int]) -> int:
+    """
+    Shift that turns a ring of tool IDs into its lexicographically smallest
+    rotation, the same for all rotations of a layout.
+    """
+    ring = tuple(ids)
+    if not ring:
+        return 0
+    smallest = min(ring)
+    return min((shift for shift in range(len(ring)) if ring[shift] == smallest),
+               key=lambda shift: ring[shift:] + ring[:shift])
+
+
+class Tool:
+    """
+    View of one turret slot. The tool ID and life live in the turret's buffers,
+    so tools are never copied when a turret is.
+    """
+    __slots__ = ("turret", "idx")
+
+    def __init__(self, turret: Turret, idx: int):
+        """
+        :param turret: The turret holding the slot.
+        :param idx: Index of the slot in the turret.
+        """
+        self.turret = turret
+        self.idx = idx
+
+    @property
+    def id(self) -> int:
+        return self.turret.ids[self.idx]
+
+    @id.setter
+    def id(self, tool_id: int) -> None:
+        self.turret.set_slot(self.idx, tool_id)
+
+    @property
+    def life(self) -> int:
+        return self.turret.lives[self.idx]
+
+    @life.setter
+    def life(self, life: int) -> None:
+        self.turret.lives[self.idx] = life
+
+    @property
+    def use(self) -> bool:
+        return self.turret.use(self.idx)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Tool):
+            return NotImplemented
+        return (self.id, self.life) == (other.id, other.life)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"Tool(id={self.id}, life={self.life})"
+
+
+class SlotIndex:
+
+    def __init__(self, slots: t.Sequence[int]):
+        """
+        Index of the tool IDs on a turret ring. For every tool ID it keeps the
+        sorted positions it occupies, and for every start index the nearest of
+        those positions clockwise and anticlockwise, so nearest lookups are O(1).
+
+        :param slots: Tool IDs in ring order.
+        """
+        self.size = len(slots)
+        self.positions: t.Dict[int, t.List[int]] = {}
+        self.cw: t.Dict[int, t.List[int]] = {}
+        self.acw: t.Dict[int, t.List[int]] = {}
+
+        for idx, tool_id in enumerate(slots):
+            self.positions.setdefault(tool_id, []).append(idx)
+
+        for tool_id, positions in self.positions.items():
+            self.cw[tool_id] = [0] * self.size
+            self.acw[tool_id] = [0] * self.size
+            for k, pos in enumerate(positions):
+                self._fill(tool_id, pos, positions[(k + 1) % len(positions)])
+
+    def _fill(self, tool_id: int, first: int, second: int) -> None:
+        """
+        Point the start indexes of the arc between two consecutive occurrences
+        of tool_id at them: (first, second] clockwise to second and
+        [first, second) anticlockwise to first. A single occurrence
+        (first == second) spans the whole ring.
+        """
+        cw, acw = self.cw[tool_id], self.acw[tool_id]
+        for step in range((second - first - 1) % self.size + 1):
+            cw[(first + step + 1) % self.size] = second
+            acw[(first + step) % self.size] = first
+
+    def reassign(self, idx: int, old_id: int, new_id: int) -> None:
+        """
+        Move slot idx from old_id to new_id, patching only the arcs next to it.
+        """
+        if old_id == new_id:
+            return
+
+        positions = self.positions[old_id]
+        k = bisect_left(positions, idx)
+        positions.pop(k)
+        if positions:
+            self._fill(old_id, positions[(k - 1) % len(positions)],
+                       positions[k % len(positions)])
+        else:
+            del self.positions[old_id], self.cw[old_id], self.acw[old_id]
+
+        positions = self.positions.get(new_id)
+        if positions is None:
+            self.positions[new_id] = [idx]
+            self.cw[new_id] = [idx] * self.size
+            self.acw[new_id] = [idx] * self.size
+            return
+        k = bisect_left(positions, idx)
+        positions.insert(k, idx)
+        self._fill(new_id, positions[k - 1], idx)
+        self._fill(new_id, idx, positions[(k + 1) % len(positions)])
+
+    def nearest(self, tool_id: int,
+                start_idx: int) -> t.Optional[t.Tuple[int, int]]:
+        """
+        :return: (index, distance) of the nearest occurrence of tool_id, clockwise
+        on ties, or None if the tool_id is not on the ring.
+        """
+        cw = self.cw.get(tool_id)
+        if cw is None:
+            return None
+        cw_idx = cw[start_idx]
+        acw_idx = self.acw[tool_id][start_idx]
+        cw_dist = (cw_idx - start_idx) % self.size
+        acw_dist = (start_idx - acw_idx) % self.size
+        if cw_dist <= acw_dist:
+            return cw_idx, cw_dist
+        return acw_idx, -acw_dist
+
+    def distances(self, tool_id: int,
+                  start_idx: int) -> t.List[t.Tuple[int, int]]:
+        """
+        :return: (index, distance) for every occurrence of tool_id, using the
+        shorter direction (clockwise on ties), nearest first.
+        """
+        results = []
+        for index in self.positions.get(tool_id, ()):
+            distance = (index - start_idx) % self.size
+            if distance > self.size - distance:
+                distance -= self.size
+            results.append((index, distance))
+        results.sort(key=lambda x: (abs(x[1]), x[1] < 0))
+        return results
+
+
+class Turret:
+
+    def __init__(self, slots: t.Sequence[int], tool_data: t.Dict[int, int]):
+        """
+        :param slots: List of tool IDs to represent the tool arrangement in the turret.
+        :param tool_data: Dictionary mapping tool_id to tool_life.
+
+        Slot IDs and remaining lives are kept in two parallel int buffers, ids
+        and lives. Tool IDs should be changed through set_slot so that the slot
+        index stays in sync with them.
+
+        Setting stats to a TurretStats makes lookups and wear-outs be counted
+        into it; copies of the turret share it.
+        """
+        self.ids = array("i", slots)
+        self.lives = array("i", [tool_data[tool_id] for tool_id in slots])
+        self.size = len(self.ids)
+        self.stats: t.Optional[TurretStats] = None
+        self._index: t.Optional[SlotIndex] = None
+        self._tools: t.Optional[t.List[Tool]] = None
+        # Cached trace of one part as (ops, trace), and the trace of the turret
+        # this one was derived from, with the slots changed since
+        self._trace: t.Optional[t.Tuple[t.Tuple[int, ...], Trace]] = None
+        self._base: t.Optional[t.Tuple[t.Tuple[int, ...], Trace]] = None
+        self._changed: t.Set[int] = set()
+
+    @classmethod
+    def from_buffers(cls,
+                     ids: array,
+                     lives: array,
+                     stats: t.Optional[TurretStats] = None) -> t.Self:
+        """
+        Build a turret that takes ownership of the given id and life buffers.
+        """
+        turret = cls.__new__(cls)
+        turret.ids = ids
+        turret.lives = lives
+        turret.size = len(ids)
+        turret.stats = stats
+        turret._index = None
+        turret._tools = None
+        turret._trace = None
+        turret._base = None
+        turret._changed = set()
+        return turret
+
+    def copy(self) -> t.Self:
+        turret = type(self).from_buffers(self.ids[:], self.lives[:],
+                                         self.stats)
+        turret.derive(self)
+        return turret
+
+    def rotated(self, shift: int) -> t.Self:
+        """
+        Copy of the turret turned so that slot shift comes first.
+        """
+        return type(self).from_buffers(self.ids[shift:] + self.ids[:shift],
+                                       self.lives[shift:] + self.lives[:shift],
+                                       self.stats)
+
+    def derive(self, parent: Turret, changed: t.Iterable[int] = ()) -> None:
+        """
+        Record that this turret is parent with the given slots changed, so that
+        its trace can be re-simulated from the parent's instead of from scratch.
+        Later set_slot calls are recorded as well.
+        """
+        if parent._trace is not None:
+            self._base, self._changed = parent._trace, set(changed)
+        elif parent._base is not None:
+            self._base = parent._base
+            self._changed = parent._changed.union(changed)
+
+    @property
+    def array(self) -> t.List[Tool]:
+        """
+        Tool views over the slots, in ring order.
+        """
+        if self._tools is None:
+            self._tools = [Tool(self, idx) for idx in range(self.size)]
+        return self._tools
+
+    @property
+    def index(self) -> SlotIndex:
+        """
+        Slot index of the current tool IDs, built on first use.
+        """
+        if self._index is None:
+            self._index = SlotIndex(self.ids)
+        return self._index
+
+    def set_slot(self, idx: int, tool_id: int) -> None:
+        """
+        Replace the tool ID at idx, keeping the slot index up to date.
+        """
+        if self.ids[idx] == tool_id:
+            return
+        if self._index is not None:
+            self._index.reassign(idx, self.ids[idx], tool_id)
+        self.ids[idx] = tool_id
+
+        if self._trace is not None:
+            self._base, self._changed = self._trace, set()
+            self._trace = None
+        if self._base is not None:
+            self._changed.add(idx)
+
+    def swap(self, i: int, j: int) -> None:
+        """
+        Swap the tools (ID and life) in slots i and j.
+        """
+        id_i, id_j = self.ids[i], self.ids[j]
+        self.set_slot(i, id_j)
+        self.set_slot(j, id_i)
+        self.lives[i], self.lives[j] = self.lives[j], self.lives[i]
+
+    def use(self, idx: int) -> bool:
+        """
+        Wear the tool at idx once.
+
+        :return: Whether the tool has life left.
+        """
+        self.lives[idx] -= 1
+        return self.lives[idx] > 0
+
+    def find_all_with_distances(self,
+                                tool_id: int,
+                                idx: int = 0) -> t.List[t.Tuple[int, int]]:
+        """
+        Find all indexes and their respective distances (clockwise: +ve, anticlockwise: 
+        -ve) for the given tool_id.
+        :param tool_id: The tool ID to search for.
+        :param idx: The starting index from which to calculate distance.
+        :return: A list of tuples with (index, distance), where distance is positive if 
+        clockwise, and negative if anticlockwise.
+        """
+        positions = self.index.positions.get(tool_id, ())
+        if self.stats is not None:
+            self.stats.finds += 1
+            self.stats.scanned += len(positions)
+
+        results = []
+        for index in positions:
+            distance = (index - idx) % self.size
+            results.append((index, distance))
+            if distance != 0:
+                results.append((index, distance - self.size))
+
+        # Same order as a ring scan: nearest first, clockwise before anticlockwise
+        results.sort(key=lambda x: (abs(x[1]), x[1] < 0))
+        return results
+
+    def find_nearest(self,
+                     tool_id: int,
+                     start_idx: int = 0) -> t.Optional[t.Tuple[int, int]]:
+        """
+           Find the nearest tool by tool_id, checking all distances and returning the
+           one with the minimum absolute distance.
+           :param tool_id: The tool ID to search for.
+           :param start_idx: The starting index from which to calculate distance.
+           :return: A tuple with (index, distance), where distance is
+           positive if clockwise, and negative if anticlockwise,
+                    or None if the tool_id is not found.
+           """
+        if self.stats is not None:
+            self.stats.finds += 1
+        return self.index.nearest(tool_id, start_idx)
+
+    def find(self,
+             tool_id: int,
+             start_idx: int = 0) -> t.List[t.Tuple[int, int]]:
+        """
+        Find all unique indexes and their respective minimum absolute distances for the given tool_id.
+        :param tool_id: The tool ID to search for.
+        :param start_idx: The starting index from which to calculate distance.
+        :return: A list of tuples with unique indexes and their corresponding minimum absolute distances.
+        """
+        if self.stats is not None:
+            self.stats.finds += 1
+            self.stats.scanned += len(self.index.positions.get(tool_id, ()))
+        return self.index.distances(tool_id, start_idx)
+
+    def create_graph(
+        self,
+        ops: t.List[int],
+        trace: t.Optional[t.Callable[[t.Dict[str, t.Any]], None]] = None
+    ) -> t.Dict[int, t.List[t.Tuple[int, int]]]:
+        """
+        Graph of the moves from slot to slot along ops. Operations whose tool
+        is not in the turret are skipped silently, unless a trace sink (such as
+        list.append) is given, which then receives a
+        {"kind": "missing", "op": i, "tool_id": tool_id} event for each.
+        """
+        graph = {}
+        current_idx = 0  # Start from the first position
+
+        for op, tool_id in enumerate(ops):
+            distances = self.find_all_with_distances(tool_id, current_idx)
+            if not distances:
+                if trace is not None:
+                    trace({"kind": "missing", "op": op, "tool_id": tool_id})
+                continue
+
+            # Create graph edges from the current index to all found distances
+            for next_idx, distance in distances:
+                if current_idx not in graph:
+                    graph[current_idx] = []
+                graph[current_idx].append((next_idx, distance))
+
+            # Update the current index to the first found position of the tool_id
+            current_idx = distances[0][0]
+
+        return graph
+
+    def create_layered_graph(
+        self, ops: t.List[int]
+    ) -> t.Dict[t.Tuple[int, int], t.List[t.Tuple[int, int]]]:
+        """
+        Like create_graph, but with one layer of nodes per operation, so that
+        every way of serving the operations is a path through the graph. Node
+        (i, idx) is the slot idx serving ops[i]; its edges (next_idx, distance)
+        lead to every slot holding ops[i + 1], with the shorter signed distance.
+        Nodes of the last operation have no edges.
+        """
+        graph: t.Dict[t.Tuple[int, int], t.List[t.Tuple[int, int]]] = {}
+        for layer, tool_id in enumerate(ops):
+            for idx in self.index.positions.get(tool_id, ()):
+                graph[(layer, idx)] = (self.find(ops[layer + 1], idx)
+                                       if layer + 1 < len(ops) else [])
+        return graph
+
+    def score(self,
+              parts: int,
+              ops: t.List[int],
+              cost: t.Optional[CostModel] = None):
+        """
+        Total rotation of the turret to machine the given number of parts, in
+        slot steps or, with a cost model, in the model's cost of every move.
+
+        Worn tools are never retired, so every part follows the same path and
+        the score is the number of parts made times that path. All scorers
+        sum a score this way, the moves of a part in walking order and then
+        times the parts, so they agree to the last bit under a cost model.
+        """
+        self._check_cost(cost)
+        made = 0
+        path = 0
+        while made < parts:
+            first_t = self.find_nearest(ops[0], 0)
+            if not first_t:
+                # print("No tool found for the first operation.")
+                # print("Parts made: ", parts)
+                return made * path
+            first_idx, _ = first_t
+            current_idx = first_idx
+            walked = 0
+            for tool_id in ops:
+                current_rot = self.find_nearest(tool_id, current_idx)
+                if not current_rot:
+                    # print(f"Tool ID {tool_id} not found in turret.")
+                    return made * path
+                position, distance = current_rot
+                # Worn tools stay in their slot here, only their life runs down
+                if not self.use(position) and self.stats is not None:
+                    self.stats.wear_outs += 1
+                walked += (abs(distance) if cost is None else
+                           cost.rows[current_idx][position])
+                current_idx = position
+            made += 1
+            path = walked
+        score = made * path
+        return score
+
+    def trace(self, ops: t.List[int]) -> Trace:
+        """
+        The (index, distance) steps of one part as score walks them: the ops[0]
+        slot nearest to index 0, then the nearest slot of every operation. The
+        trace stops early at the first tool missing from the turret.
+
+        Traces are cached. For a turret derived from another one (copy, derive),
+        the parent's steps are reused up to the first lookup whose search range
+        (the ring within the distance it travelled) holds a changed slot, and
+        only the rest is re-simulated.
+        """
+        key = tuple(ops)
+        if self._trace is not None and self._trace[0] == key:
+            return self._trace[1]
+
+        trace: Trace = []
+        point = 0
+        if self._base is not None and self._base[0] == key:
+            for position, distance in self._base[1]:
+                if any(
+                        min((idx - point) % self.size, (point - idx) %
+                            self.size) <= abs(distance)
+                        for idx in self._changed):
+                    break
+                trace.append((position, distance))
+                point = position
+
+        # A handful of lookups is cheaper as outward scans than building the index
+        find_nearest = (self._index.nearest
+                        if self._index is not None else self._scan_nearest)
+        lookups = 0
+        for tool_id in ([ops[0]] + ops)[len(trace):]:
+            nearest = find_nearest(tool_id, point)
+            lookups += 1
+            if nearest is None:
+                break
+            trace.append(nearest)
+            point = nearest[0]
+        if self.stats is not None:
+            self.stats.finds += lookups
+
+        self._trace = (key, trace)
+        self._base, self._changed = None, set()
+        return trace
+
+    def _scan_nearest(self, tool_id: int,
+                      start_idx: int) -> t.Optional[t.Tuple[int, int]]:
+        """
+        find_nearest by scanning outwards from start_idx, clockwise first.
+        """
+        nearest = None
+        step = 0
+        for step in range(self.size // 2 + 1):
+            idx = (start_idx + step) % self.size
+            if self.ids[idx] == tool_id:
+                nearest = idx, step
+                break
+            idx = (start_idx - step) % self.size
+            if self.ids[idx] == tool_id:
+                nearest = idx, -step
+                break
+        if self.stats is not None:
+            self.stats.scanned += 2 * step + 2
+        return nearest
+
+    def traced_score(self,
+                     parts: int,
+                     ops: t.List[int],
+                     cost: t.Optional[CostModel] = None) -> float:
+        """
+        Same result as score, computed from the trace of one part. Worn tools
+        are never retired, so every part follows that trace. Tool lives are not
+        touched.
+        """
+        self._check_cost(cost)
+        trace = self.trace(ops)
+        if parts <= 0 or len(trace) <= len(ops):
+            return 0
+        if cost is None:
+            return parts * sum(abs(distance) for _, distance in trace[1:])
+        return parts * sum(cost.rows[previous][position]
+                           for (previous, _), (position, _) in pairwise(trace))
+
+    def best_start(
+            self,
+            parts: int,
+            ops: t.List[int],
+            cost: t.Optional[CostModel] = None
+    ) -> t.Optional[t.Tuple[int, float]]:
+        """
+        Score every slot holding ops[0] as the start of each part, instead of
+        the one nearest to index 0. Paths from different starts that meet at
+        the same slot and operation share the rest of their walk, so it is
+        looked up only once. Like score, every part pays for the ops[0] move
+        from its start slot to itself (the cost model's diagonal).
+
+        :return: (start slot, score) of the best start, the lowest slot on
+        ties, or None when a tool of ops is missing from the turret.
+        """
+        self._check_cost(cost)
+        positions = self.index.positions
+        if any(tool_id not in positions for tool_id in ops):
+            return None
+
+        # (step, slot) -> (slot serving ops[step] from slot, cost of the move)
+        moves: t.Dict[t.Tuple[int, int], t.Tuple[int, float]] = {}
+        lookups = 0
+        best: t.Optional[t.Tuple[int, float]] = None
+        for start in positions[ops[0]]:
+            # Moves are summed in walking order, as score sums them
+            path = 0
+            point = start
+            for step, tool_id in enumerate(ops):
+                move = moves.get((step, point))
+                if move is None:
+                    nearest = self.index.nearest(tool_id, point)
+                    assert nearest is not None  # Every tool of ops is present
+                    idx, distance = nearest
+                    lookups += 1
+                    move = idx, (abs(distance)
+                                 if cost is None else cost.rows[point][idx])
+                    moves[(step, point)] = move
+                point = move[0]
+                path += move[1]
+            if best is None or path < best[1]:
+                best = start, path
+
+        if self.stats is not None:
+            self.stats.finds += lookups
+        assert best is not None
+        return best[0], max(parts, 0) * best[1]
+
+    def _check_cost(self, cost: t.Optional[CostModel]) -> None:
+        if cost is not None and cost.size != self.size:
+            raise ValueError(
+                f"Cost model for {cost.size} slots used on a turret with "
+                f"{self.size} slots.")
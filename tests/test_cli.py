@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+from cnc import cli, schemas
+
+
+@pytest.fixture
+def example():
+    return json.loads(schemas.SCENARIOS_PATH.read_text())["example"]
+
+
+@pytest.mark.parametrize("workers", [0, 1])
+def test_run_emits_failed_jobs_as_errors(example, workers):
+    jobs = [("good", example), ("bad", {"operations": [4]})]
+    results = []
+    failures = cli.run(jobs, {"wear": "retire"}, workers, results.append, cli.evaluate)
+
+    assert failures == 1
+    results.sort(key=lambda result: result["name"])
+    assert [result["name"] for result in results] == ["bad", "good"]
+    assert "KeyError" in results[0]["error"]
+    assert results[1]["score"] == 3275
+
+
+def test_checkpoint_skips_finished_jobs_and_retries_failures(example, tmp_path, capsys):
+    source = tmp_path / "jobs.jsonl"
+    jobs = [{"name": name, **example} for name in ("a", "b", "c")]
+    source.write_text(
+        "".join(json.dumps(job) + "\n" for job in jobs) + '{"name": "bad"}\n'
+    )
+    checkpoint = tmp_path / "done.jsonl"
+    # Job a finished, the line of job b was cut short by an interruption
+    checkpoint.write_text('{"name": "a", "score": 3275}\n{"name": "b", "sc')
+
+    def run():
+        status = cli.main([str(source), "--score", "--checkpoint", str(checkpoint)])
+        lines = capsys.readouterr().out.splitlines()
+        return status, [json.loads(line)["name"] for line in lines]
+
+    assert run() == (1, ["b", "c", "bad"])
+    assert cli.read_checkpoint(checkpoint) == {"a", "b", "c"}
+    assert run() == (1, ["bad"])
+    assert cli.read_checkpoint(checkpoint) == {"a", "b", "c"}
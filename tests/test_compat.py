@@ -0,0 +1,153 @@
+import json
+
+import pytest
+
+import cnc
+from cnc import (
+    JsonLinesTrace,
+    RetiringTurret,
+    TraceEvent,
+    Turret,
+    compat,
+    load_scenarios,
+)
+
+
+def test_exports_are_listed_in_all():
+    assert sorted(cnc.__all__) == sorted(cnc._EXPORTS)
+    for name in cnc.__all__:
+        assert getattr(cnc, name) is not None
+
+
+def test_retiring_turret_wraps_a_turret():
+    scenario = load_scenarios()["example"]
+    retiring = scenario.turret()
+    assert isinstance(retiring.turret, Turret)
+    assert not isinstance(retiring, Turret)
+
+    copy = retiring.copy()
+    assert isinstance(copy, RetiringTurret)
+    copy.score(scenario.parts, scenario.operations, scenario.point)
+    assert list(retiring.lives) == [scenario.data[i] for i in scenario.allocation]
+    assert compat.score(
+        scenario.allocation,
+        scenario.data,
+        scenario.parts,
+        scenario.operations,
+        "retire",
+    ) == retiring.score(scenario.parts, scenario.operations, scenario.point)
+
+
+def test_retiring_tool_views_wear_the_retiring_way():
+    retiring = RetiringTurret([1, 2, 1], {1: 2, 2: 1})
+    tool = retiring.array[0]
+    assert isinstance(tool, compat.RetiringTool)
+    assert tool is retiring.array[0]
+    assert [tool.use for _ in range(4)] == [True, False, False, False]
+    assert tool.life == retiring.lives[0] == -1
+
+    # The views of the wrapped turret keep wearing worn tools
+    kept = retiring.turret.array[2]
+    assert [kept.use for _ in range(4)] == [True, False, False, False]
+    assert kept.life == -2
+
+
+def expand(records):
+    """
+    (part, path, cost, point, complete) of every part machined by records.
+    """
+    return [
+        (record.part + i, record.path, record.cost, record.point, record.complete)
+        for record in records
+        for i in range(record.count)
+    ]
+
+
+@pytest.mark.parametrize("name", ["example", "factory", "study"])
+def test_fast_forward_matches_the_per_part_walk(name):
+    scenario = load_scenarios()[name]
+    walked = scenario.turret()
+    records = list(
+        walked.simulate(
+            scenario.parts, scenario.operations, scenario.point, fast_forward=False
+        )
+    )
+    assert all(record.count == 1 for record in records)
+
+    skipped = scenario.turret()
+    fast = list(skipped.simulate(scenario.parts, scenario.operations, scenario.point))
+    assert expand(fast) == expand(records)
+    assert skipped.lives == walked.lives
+    assert skipped.ids == walked.ids
+
+    score = scenario.turret().score(scenario.parts, scenario.operations, scenario.point)
+    assert score == sum(record.cost for record in records if record.complete)
+
+
+@pytest.mark.parametrize("fast_forward", [False, True])
+def test_resume_continues_an_interrupted_simulation(fast_forward):
+    scenario = load_scenarios()["factory"]
+    ops, parts, point = scenario.operations, scenario.parts, scenario.point
+    uninterrupted = scenario.turret()
+    expected = list(uninterrupted.simulate(parts, ops, point, fast_forward))
+
+    for stop in (1, 2, len(expected) // 2, len(expected) - 1):
+        turret = scenario.turret()
+        records = []
+        for record in turret.simulate(parts, ops, point, fast_forward):
+            records.append(record)
+            if len(records) == stop:
+                break
+        records.extend(turret.resume(records[-1], ops, fast_forward))
+        assert expand(records) == expand(expected)
+        assert turret.lives == uninterrupted.lives
+
+
+def test_trace_reports_path_changes_and_the_missing_tool():
+    scenario = load_scenarios()["example"]
+    events = []
+    score = scenario.turret().score(
+        scenario.parts, scenario.operations, scenario.point, trace=events.append
+    )
+    assert score == 3275
+    # As the former print output: "while <remaining> parts were remaining"
+    assert [
+        (
+            event.kind,
+            event.part,
+            event.remaining,
+            event.old_path,
+            event.new_path,
+            event.weight,
+        )
+        for event in events
+    ] == [
+        ("path", 1, 299, "", "78671", 6),
+        ("path", 100, 200, "78671", "75671", 8),
+        ("path", 150, 150, "75671", "75372", 13),
+        ("path", 199, 101, "75372", "74372", 14),
+        ("path", 298, 2, "74372", "7372", 14),
+        ("missing", 299, 1, "7372", "7", 3),
+    ]
+    assert events[0].slots[:3] == [(1, 149), (1, 150), (3, 150)]
+
+
+def test_json_lines_trace_round_trips_the_events(tmp_path):
+    scenario = load_scenarios()["example"]
+    events = []
+    path = tmp_path / "trace.jsonl"
+    with JsonLinesTrace(path) as sink:
+
+        def trace(event):
+            events.append(event)
+            sink(event)
+
+        scenario.turret().score(
+            scenario.parts, scenario.operations, scenario.point, trace=trace
+        )
+
+    loaded = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [
+        TraceEvent(**{**fields, "slots": [tuple(slot) for slot in fields["slots"]]})
+        for fields in loaded
+    ] == events
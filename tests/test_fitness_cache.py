@@ -0,0 +1,41 @@
+import random
+
+from cnc import GA, FitnessCache, Turret, load_scenarios
+
+
+def test_rotation_keys_only_merge_equal_scores():
+    factory = load_scenarios()["factory"]
+    ops, data, parts = factory.operations, factory.data, 1
+    cache = FitnessCache(rotations=True)
+    scores = {}
+    random.seed(0)
+    for _ in range(20):
+        layout = list(factory.allocation)
+        random.shuffle(layout)
+        for shift in range(len(layout)):
+            ids = layout[shift:] + layout[:shift]
+            score = Turret(ids, data).score(parts, ops)
+            assert scores.setdefault(cache.key(ids, ops, data, parts), score) == score
+
+        # Mirror images keep their own keys
+        mirror = layout[::-1]
+        if (
+            Turret(mirror, data).score(parts, ops)
+            != scores[cache.key(layout, ops, data, parts)]
+        ):
+            assert cache.key(mirror, ops, data, parts) != cache.key(
+                layout, ops, data, parts
+            )
+
+
+def test_shared_cache_keeps_scoring_modes_apart():
+    layout, ops, data = [1, 2, 2, 2, 3, 2, 1, 1], [1, 3, 1, 2], {1: 9, 2: 9, 3: 9}
+    cache = FitnessCache()
+    fixed = GA(3, ops, data, 10, cache=cache)
+    multi_start = GA(3, ops, data, 10, cache=cache, multi_start=True)
+    turret = Turret(layout, data)
+
+    assert fixed.fitness_function(turret) == 70
+    assert multi_start.fitness_function(turret) == 50
+    assert fixed.evaluate_population([turret]).tolist() == [70]
+    assert multi_start.evaluate_population([turret]).tolist() == [50]
@@ -0,0 +1,175 @@
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from cnc import GA, CostModel, FitnessCache, Turret, load_scenarios
+
+
+@pytest.fixture
+def factory():
+    return load_scenarios()["factory"]
+
+
+def test_multi_start_layout_reproduces_score_with_cost_model(factory):
+    cost = CostModel.indexing(len(factory.allocation), 1.0, 3.0, 1.0, 0.5)
+    for seed in range(5):
+        random.seed(seed)
+        ga = GA(
+            3,
+            factory.operations,
+            factory.data,
+            factory.parts,
+            multi_start=True,
+            cost_model=cost,
+        )
+        result = ga.run(5, 20, factory.allocation, dict(Counter(factory.allocation)))
+        turret = Turret(result.layout, factory.data)
+        assert turret.score(factory.parts, factory.operations, cost) == result.score
+
+
+def test_multi_start_charges_the_cost_diagonal():
+    layout, ops, data = [1, 2, 3, 4], [1, 2, 3, 4], {1: 9, 2: 9, 3: 9, 4: 9}
+    cost = CostModel(CostModel.steps(4).matrix + np.eye(4))
+    turret = Turret(layout, data)
+    score = turret.copy().score(10, ops, cost)
+    assert turret.best_start(10, ops, cost) == (0, score)
+
+    ga = GA(3, ops, data, 10, multi_start=True, cost_model=cost)
+    assert ga.evaluate_population([turret]).tolist() == [score]
+
+
+@pytest.mark.parametrize("multi_start", [False, True])
+def test_scorers_agree_exactly_with_cost_model(factory, multi_start):
+    cost = CostModel.indexing(len(factory.allocation), 1.0, 3.0, 1.0, 0.5)
+    random.seed(0)
+    ga = GA(
+        3,
+        factory.operations,
+        factory.data,
+        factory.parts,
+        multi_start=multi_start,
+        cost_model=cost,
+    )
+    population = ga.create_initial_population(20, factory.allocation)
+    vectorized = ga.evaluate_population(population).tolist()
+
+    workers = GA(
+        3,
+        factory.operations,
+        factory.data,
+        factory.parts,
+        workers=2,
+        multi_start=multi_start,
+        cost_model=cost,
+    )
+    assert workers.evaluate_population(population).tolist() == vectorized
+    for turret, score in zip(population, vectorized, strict=True):
+        if multi_start:
+            best = turret.best_start(factory.parts, factory.operations, cost)
+            assert best is not None
+            assert best[1] == score
+        else:
+            assert turret.copy().score(factory.parts, factory.operations, cost) == score
+            assert turret.traced_score(factory.parts, factory.operations, cost) == score
+
+
+@pytest.mark.parametrize("method", ["ox", "pmx"])
+def test_order_preserving_crossovers_keep_the_tools(factory, method):
+    random.seed(0)
+    ga = GA(3, factory.operations, factory.data, crossover_method=method)
+    population = ga.create_initial_population(20, factory.allocation)
+    for _ in range(200):
+        parent1, parent2 = random.sample(population, 2)
+        offspring = ga.crossover(parent1, parent2)
+        assert Counter(offspring.ids) == Counter(parent1.ids)
+        assert list(offspring.lives) == [factory.data[i] for i in offspring.ids]
+    assert not any(ga._counts)
+
+
+def test_repair_restores_the_distribution(factory):
+    distr = dict(Counter(factory.allocation))
+    random.seed(0)
+    ga = GA(3, factory.operations, factory.data)
+    for _ in range(200):
+        layout = [random.choice(list(factory.data)) for _ in factory.allocation]
+        repaired = ga.repair(Turret(layout, factory.data), distr)
+        assert Counter(repaired.ids) == distr
+        assert list(repaired.lives) == [factory.data[i] for i in repaired.ids]
+    assert not any(ga._counts)
+
+
+@pytest.mark.parametrize("indexing", [False, True])
+def test_delta_scores_match_fresh_turrets(factory, indexing):
+    size = len(factory.allocation)
+    cost = CostModel.indexing(size, 1.0, 3.0, 1.0, 0.5) if indexing else None
+    distr = dict(Counter(factory.allocation))
+    random.seed(0)
+    ga = GA(
+        3, factory.operations, factory.data, factory.parts, delta=True, cost_model=cost
+    )
+    population = ga.create_initial_population(20, factory.allocation)
+    scores = ga.evaluate_population(population)
+    for _ in range(10):
+        population = ga.next_generation(population, distr, 20, 0.05, 1, scores)
+        scores = ga.evaluate_population(population)
+        assert scores.tolist() == ga._evaluate_batch(population).tolist()
+        for turret, score in zip(population, scores.tolist(), strict=True):
+            fresh = Turret(list(turret.ids), factory.data)
+            assert fresh.score(factory.parts, factory.operations, cost) == score
+
+
+@pytest.mark.parametrize("cache", [False, True])
+def test_resumed_run_reproduces_an_uninterrupted_run(factory, tmp_path, cache):
+    def run(generations, checkpoint, resume=False):
+        ga = GA(
+            3,
+            factory.operations,
+            factory.data,
+            factory.parts,
+            cache=FitnessCache() if cache else None,
+        )
+        return ga.run(
+            generations,
+            20,
+            factory.allocation,
+            dict(Counter(factory.allocation)),
+            0.05,
+            checkpoint=str(checkpoint),
+            checkpoint_interval=4,
+            resume=resume,
+        )
+
+    random.seed(0)
+    expected = run(12, tmp_path / "uninterrupted.ckpt")
+
+    random.seed(0)
+    checkpoint = tmp_path / "interrupted.ckpt"
+    run(6, checkpoint)
+    random.seed(1)  # The random state comes from the checkpoint
+    result = run(12, checkpoint, resume=True)
+
+    assert result.layout == expected.layout
+    assert result.score == expected.score
+    assert result.history == expected.history
+    assert result.generations == expected.generations
+
+
+@pytest.mark.parametrize("multi_start", [False, True])
+def test_runs_match_across_worker_counts(factory, multi_start):
+    distr = dict(Counter(factory.allocation))
+    results = []
+    for workers in (0, 1, 3):
+        random.seed(0)
+        with GA(
+            3,
+            factory.operations,
+            factory.data,
+            factory.parts,
+            workers=workers,
+            multi_start=multi_start,
+        ) as ga:
+            results.append(ga.run(5, 20, factory.allocation, distr, 0.05))
+    assert results[1] == results[0]
+    assert results[2] == results[0]
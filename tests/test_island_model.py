@@ -0,0 +1,53 @@
+from collections import Counter
+
+import pytest
+
+from cnc import IslandModel, load_scenarios
+
+
+@pytest.fixture
+def example():
+    return load_scenarios()["example"]
+
+
+def island_model(scenario, **kwargs):
+    return IslandModel(
+        3,
+        scenario.operations,
+        scenario.data,
+        dict(Counter(scenario.allocation)),
+        parts=scenario.parts,
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize("topology", ["ring", "full"])
+def test_runs_are_reproducible_from_their_seeds(example, topology):
+    model = island_model(
+        example,
+        islands=3,
+        population_size=8,
+        migration_interval=2,
+        topology=topology,
+        seeds=[3, 1, 4],
+    )
+    result = model.run(6, example.allocation)
+    assert model.run(6, example.allocation) == result
+    assert len(result.history) == 3
+    assert all(len(history) == 6 for history in result.history)
+
+
+def test_immigrants_never_replace_the_elites():
+    factory = load_scenarios()["factory"]
+    # Eight immigrants per migration would take the whole population of six
+    model = island_model(
+        factory,
+        islands=3,
+        population_size=6,
+        elites=2,
+        migration_interval=1,
+        migrants=4,
+        topology="full",
+    )
+    for history in model.run(6, factory.allocation).history:
+        assert history == sorted(history, reverse=True)
@@ -0,0 +1,48 @@
+import random
+from collections import Counter
+from itertools import permutations
+
+from cnc import BranchAndBound, Turret, load_scenarios, optimal_plan
+
+
+def solver(scenario):
+    return BranchAndBound(
+        scenario.operations,
+        scenario.data,
+        dict(Counter(scenario.allocation)),
+        scenario.parts,
+    )
+
+
+def test_solve_proves_the_brute_force_optimum():
+    example = load_scenarios()["example"]
+    layouts = set(permutations(example.allocation))
+    best = min(
+        Turret(list(layout), example.data).score(example.parts, example.operations)
+        for layout in layouts
+    )
+
+    result = solver(example).solve()
+    assert result.optimal
+    assert result.score == result.lower_bound == best
+    assert Counter(result.layout) == Counter(example.allocation)
+    turret = Turret(result.layout, example.data)
+    assert turret.score(example.parts, example.operations) == best
+
+
+def test_lower_bound_holds_for_random_layouts():
+    factory = load_scenarios()["factory"]
+    search = solver(factory)
+    bound = search.lower_bound()
+    random.seed(0)
+    for _ in range(50):
+        layout = list(factory.allocation)
+        random.shuffle(layout)
+        score = Turret(layout, factory.data).score(factory.parts, factory.operations)
+        assert bound <= search.lower_bound(layout) <= score
+
+        plan = optimal_plan(Turret(layout, factory.data), factory.operations)
+        assert plan is not None
+        length, slots = plan
+        assert search.lower_bound(layout) == factory.parts * length
+        assert [layout[idx] for idx in slots] == factory.operations
@@ -0,0 +1,38 @@
+import random
+
+from cnc import SlotIndex, Turret
+
+
+def test_reassign_matches_a_rebuilt_index():
+    random.seed(0)
+    for size in (1, 2, 5, 12):
+        slots = [random.randint(0, 3) for _ in range(size)]
+        index = SlotIndex(slots)
+        for _ in range(200):
+            idx, tool_id = random.randrange(size), random.randint(0, 4)
+            index.reassign(idx, slots[idx], tool_id)
+            slots[idx] = tool_id
+
+            rebuilt = SlotIndex(slots)
+            assert index.positions == rebuilt.positions
+            assert index.cw == rebuilt.cw
+            assert index.acw == rebuilt.acw
+            for tool_id in range(6):
+                for start in range(size):
+                    assert index.nearest(tool_id, start) == rebuilt.nearest(
+                        tool_id, start
+                    )
+
+
+def test_set_slot_keeps_the_index_in_sync():
+    random.seed(1)
+    turret = Turret([1, 2, 3, 1, 2, 3, 4, 4], dict.fromkeys(range(6), 9))
+    assert turret.index.size == turret.size  # Build the index before the changes
+    for _ in range(100):
+        turret.set_slot(random.randrange(turret.size), random.randint(0, 5))
+        rebuilt = SlotIndex(turret.ids)
+        for tool_id in range(6):
+            for start in range(turret.size):
+                assert turret.index.nearest(tool_id, start) == rebuilt.nearest(
+                    tool_id, start
+                )